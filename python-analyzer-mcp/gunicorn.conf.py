@@ -0,0 +1,18 @@
+"""Gunicorn configuration for the Python Analyzer HTTP server
+
+Usage (Linux/Mac): gunicorn -c gunicorn.conf.py http_server:app
+"""
+import multiprocessing
+
+bind = '0.0.0.0:7301'
+
+# Each worker owns a pool of analyzer processes (mypy, pylint, vulture) that
+# does the CPU-bound work, so a couple of event-loop workers is plenty; the
+# cores are split between their pools.
+workers = 2
+worker_class = 'uvicorn_worker.UvicornWorker'
+raw_env = [f'PYTHON_ANALYZER_WORKERS={max(1, multiprocessing.cpu_count() // workers)}']
+
+# Cold mypy/pylint runs can take several seconds on large inputs
+timeout = 120
+graceful_timeout = 30
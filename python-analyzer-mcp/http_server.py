@@ -1,190 +1,413 @@
 #!/usr/bin/env python3
 """Python Analyzer HTTP Server with auto-generated OpenAPI"""
-from flask import Flask, jsonify
-from flask_restx import Api, Resource, fields
-from flask_cors import CORS
-import sys
+import argparse
+import asyncio
+import hashlib
 import os
+import sys
+from contextlib import asynccontextmanager
+from functools import cache
+from typing import (Annotated, Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List,
+                    Optional, Tuple, Type, TypeVar, cast)
+
+import msgspec
+import orjson
+import uvicorn
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Add project root to path so the src package resolves
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.tools import ANALYZE_ALL_TOOLS, PythonTools
+
+class OrjsonResponse(JSONResponse):
+    """JSON response serialized with orjson (large diagnostic lists serialize in C)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+class AnalyzerAPI(FastAPI):
+    """FastAPI app whose OpenAPI spec also carries the msgspec request model schemas"""
+
+    def openapi(self) -> Dict[str, Any]:
+        """Generate the OpenAPI spec, adding the request model schemas referenced by body_doc"""
+        generated = self.openapi_schema is None
+        schema = super().openapi()
+        if generated:
+            _, components = msgspec.json.schema_components(
+                REQUEST_MODELS, ref_template='#/components/schemas/{name}')
+            schema.setdefault('components', {}).setdefault('schemas', {}).update(components)
+        return schema
+
+SERVER_PORT = 7301
+
+# Size of the analyzer process pool (set by --workers; defaults to PythonTools')
+WORKERS_ENV = 'PYTHON_ANALYZER_WORKERS'
+
+py_tools: Optional[PythonTools] = None
+
+
+def _require_tools() -> PythonTools:
+    """Return the server's PythonTools (routes only run after lifespan created it)"""
+    assert py_tools is not None, 'PythonTools is created by the lifespan handler'
+    return py_tools
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from tools import PythonTools
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Create the analyzer tools on startup and stop their worker pool on shutdown"""
+    global py_tools
+    workers = os.environ.get(WORKERS_ENV)
+    tools = PythonTools(workers=int(workers) if workers else None)
+    py_tools = tools
+    yield
+    tools.close()
 
-app = Flask(__name__)
-CORS(app)
+class StreamAwareGZipMiddleware:
+    """GZip responses except those of the NDJSON stream routes"""
 
-# Configure Flask-RESTX with OpenAPI info
-api = Api(
-    app,
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 9) -> None:
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=compresslevel)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Compressing a stream buffers it, so its lines would no longer reach the
+        # client as they are sent. Excluding by path rather than by content type
+        # works with every Starlette release FastAPI supports
+        if scope['type'] == 'http' and scope['path'].endswith('/stream'):
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+# Configure FastAPI with OpenAPI info
+app = AnalyzerAPI(
     version='1.0.0',
     title='Python Analyzer API',
     description='Python code analysis tools with auto-generated OpenAPI documentation',
-    doc='/docs',  # Serve Swagger UI at /docs
-    prefix='/api/python'
+    docs_url='/docs',  # Serve Swagger UI at /docs
+    default_response_class=OrjsonResponse,
+    lifespan=lifespan
 )
+app.add_middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])
+# Diagnostic payloads are large and repetitive; compress anything over 1 KB.
+# NDJSON streams are left alone so each line reaches the client as soon as it is sent
+app.add_middleware(StreamAwareGZipMiddleware, minimum_size=1024, compresslevel=5)
 
-py_tools = PythonTools()
-SERVER_PORT = 7301
+api = APIRouter(prefix='/api/python')
+
+@cache
+def openapi_bytes() -> Tuple[bytes, str]:
+    """Serialize the OpenAPI spec once (routes are fixed after startup) along with its ETag"""
+    body = orjson.dumps(app.openapi())
+    return body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weakly compare an If-None-Match header with an ETag, as If-None-Match requires"""
+    if if_none_match.strip() == '*':
+        return True
+    # Proxies may weaken the validator (W/"..."); weak comparison ignores that
+    opaque = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == opaque for tag in if_none_match.split(','))
 
 # Add custom /description endpoint that returns JSON spec
-@app.route('/description')
-def get_description():
-    """Return OpenAPI specification as JSON"""
-    return jsonify(api.__schema__)
-
-# Define request/response models
-analyze_model = api.model('AnalyzeRequest', {
-    'code': fields.String(required=True, description='Python code to analyze'),
-    'fileName': fields.String(description='Optional file name'),
-    'pythonVersion': fields.String(description='Python version (default: auto)')
-})
-
-symbols_model = api.model('SymbolsRequest', {
-    'code': fields.String(required=True, description='Python code to analyze'),
-    'fileName': fields.String(description='Optional file name'),
-    'filter': fields.String(description="Filter: 'class', 'function', 'variable', or 'all'")
-})
-
-format_model = api.model('FormatRequest', {
-    'code': fields.String(required=True, description='Python code to format')
-})
-
-metrics_model = api.model('MetricsRequest', {
-    'code': fields.String(required=True, description='Python code to analyze'),
-    'fileName': fields.String(description='Optional file name')
-})
-
-completions_model = api.model('CompletionsRequest', {
-    'code': fields.String(required=True, description='Python code'),
-    'line': fields.Integer(required=True, description='Line number (1-based)'),
-    'column': fields.Integer(required=True, description='Column number (0-based)')
-})
-
-autopep8_model = api.model('Autopep8Request', {
-    'code': fields.String(required=True, description='Python code to format'),
-    'maxLineLength': fields.Integer(description='Maximum line length (default: 79)')
-})
-
-@api.route('/analyze')
-class AnalyzeCode(Resource):
-    @api.doc('analyze_code')
-    @api.expect(analyze_model)
-    def post(self):
-        '''Analyze Python code for errors and warnings'''
-        data = api.payload
-        result = py_tools.analyze_code(
-            code=data['code'],
-            file_name=data.get('fileName'),
-            python_version=data.get('pythonVersion', 'auto')
-        )
-        return result
-
-@api.route('/symbols')
-class GetSymbols(Resource):
-    @api.doc('get_symbols')
-    @api.expect(symbols_model)
-    def post(self):
-        '''Extract symbols (classes, functions, variables) from Python code'''
-        data = api.payload
-        result = py_tools.get_symbols(
-            code=data['code'],
-            file_name=data.get('fileName'),
-            filter=data.get('filter')
-        )
-        return result
-
-@api.route('/format')
-class FormatCode(Resource):
-    @api.doc('format_code')
-    @api.expect(format_model)
-    def post(self):
-        '''Format Python code using black formatter'''
-        data = api.payload
-        result = py_tools.format_code(code=data['code'])
-        return result
-
-@api.route('/metrics')
-class CalculateMetrics(Resource):
-    @api.doc('calculate_metrics')
-    @api.expect(metrics_model)
-    def post(self):
-        '''Calculate code metrics including cyclomatic complexity'''
-        data = api.payload
-        result = py_tools.calculate_metrics(
-            code=data['code'],
-            file_name=data.get('fileName')
-        )
-        return result
-
-@api.route('/type-check')
-class TypeCheck(Resource):
-    @api.doc('type_check')
-    @api.expect(metrics_model)
-    def post(self):
-        '''Run static type checking using mypy'''
-        data = api.payload
-        result = py_tools.type_check(
-            code=data['code'],
-            file_name=data.get('fileName')
-        )
-        return result
-
-@api.route('/detect-dead-code')
-class DetectDeadCode(Resource):
-    @api.doc('detect_dead_code')
-    @api.expect(metrics_model)
-    def post(self):
-        '''Detect unused functions, classes, and variables using vulture'''
-        data = api.payload
-        result = py_tools.detect_dead_code(
-            code=data['code'],
-            file_name=data.get('fileName')
-        )
-        return result
-
-@api.route('/lint')
-class ComprehensiveLint(Resource):
-    @api.doc('comprehensive_lint')
-    @api.expect(metrics_model)
-    def post(self):
-        '''Run comprehensive linting using pylint'''
-        data = api.payload
-        result = py_tools.comprehensive_lint(
-            code=data['code'],
-            file_name=data.get('fileName')
-        )
-        return result
-
-@api.route('/completions')
-class GetCompletions(Resource):
-    @api.doc('get_completions')
-    @api.expect(completions_model)
-    def post(self):
-        '''Get code completions at a specific position using jedi'''
-        data = api.payload
-        result = py_tools.get_completions(
-            code=data['code'],
-            line=data['line'],
-            column=data['column']
-        )
-        return result
-
-@api.route('/format-autopep8')
-class FormatAutopep8(Resource):
-    @api.doc('format_autopep8')
-    @api.expect(autopep8_model)
-    def post(self):
-        '''Format Python code using autopep8 as an alternative to black'''
-        data = api.payload
-        result = py_tools.format_with_autopep8(
-            code=data['code'],
-            max_line_length=data.get('maxLineLength')
-        )
-        return result
+@app.get('/description', include_in_schema=False)
+async def get_description(request: Request) -> Response:
+    """Return OpenAPI specification as JSON (304 when the client's copy is current)"""
+    body, etag = openapi_bytes()
+    headers = {'Cache-Control': 'public, max-age=3600', 'ETag': etag}
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type='application/json', headers=headers)
+
+@app.get('/stats', include_in_schema=False, response_model=None)
+def get_stats() -> Dict[str, Any]:
+    """Return analyzer cache hit/miss statistics"""
+    return _require_tools().cache_stats()
+
+# Define request models. msgspec validates and decodes a body in one C call,
+# which is cheaper per request than FastAPI's JSON parse + model validation
+CodeField = Annotated[str, msgspec.Meta(description='Python code to analyze')]
+FileNameField = Annotated[Optional[str], msgspec.Meta(description='Optional file name')]
+VersionField = Annotated[Optional[str], msgspec.Meta(description='Python version (default: auto)')]
+LimitField = Annotated[Optional[Annotated[int, msgspec.Meta(ge=0)]], msgspec.Meta(
+    description='Optional maximum number of items to return (counts still cover all of them)')]
+
+class AnalyzeRequest(msgspec.Struct):
+    code: CodeField
+    fileName: FileNameField = None
+    pythonVersion: VersionField = 'auto'
+    limit: LimitField = None
+
+class SymbolsRequest(msgspec.Struct):
+    code: CodeField
+    fileName: FileNameField = None
+    filter: Annotated[Optional[str], msgspec.Meta(
+        description="Filter: 'class', 'function', 'variable', or 'all'")] = None
+    limit: LimitField = None
+
+class FormatRequest(msgspec.Struct):
+    code: Annotated[str, msgspec.Meta(description='Python code to format')]
+
+class MetricsRequest(msgspec.Struct):
+    code: CodeField
+    fileName: FileNameField = None
+
+class DiagnosticsRequest(msgspec.Struct):
+    code: CodeField
+    fileName: FileNameField = None
+    limit: LimitField = None
+
+class StreamRequest(msgspec.Struct):
+    code: CodeField
+    fileName: FileNameField = None
+
+class CompletionsRequest(msgspec.Struct):
+    code: Annotated[str, msgspec.Meta(description='Python code')]
+    line: Annotated[int, msgspec.Meta(description='Line number (1-based)')]
+    column: Annotated[int, msgspec.Meta(description='Column number (0-based)')]
+    fileName: FileNameField = None
+    limit: Annotated[Optional[Annotated[int, msgspec.Meta(ge=0)]], msgspec.Meta(
+        description='Optional maximum number of completions (at most 50 are returned)')] = None
+
+class Autopep8Request(msgspec.Struct):
+    code: Annotated[str, msgspec.Meta(description='Python code to format')]
+    maxLineLength: Annotated[Optional[int], msgspec.Meta(
+        description='Maximum line length (default: 79)')] = None
+
+class AnalyzeAllRequest(msgspec.Struct):
+    code: CodeField
+    fileName: FileNameField = None
+    pythonVersion: VersionField = 'auto'
+    tools: Annotated[Optional[List[str]], msgspec.Meta(
+        description="Analyzers to run (default: all): 'analyze_code', 'get_symbols', "
+                    "'calculate_metrics', 'type_check', 'detect_dead_code', 'comprehensive_lint'")] = None
+
+class SourceFile(msgspec.Struct):
+    fileName: Annotated[str, msgspec.Meta(description='File name (unique within the request)')]
+    code: CodeField
+
+class AnalyzeManyRequest(msgspec.Struct):
+    files: Annotated[List[SourceFile], msgspec.Meta(description='Files to analyze')]
+    pythonVersion: VersionField = 'auto'
+    tools: Annotated[Optional[List[str]], msgspec.Meta(
+        description="Analyzers to run on every file (default: all): 'analyze_code', 'get_symbols', "
+                    "'calculate_metrics', 'type_check', 'detect_dead_code', 'comprehensive_lint'")] = None
+
+REQUEST_MODELS = (AnalyzeRequest, SymbolsRequest, FormatRequest, MetricsRequest,
+                  DiagnosticsRequest, StreamRequest, CompletionsRequest, Autopep8Request,
+                  AnalyzeAllRequest, AnalyzeManyRequest)
+_DECODERS: Dict[Type[msgspec.Struct], msgspec.json.Decoder[Any]] = {
+    model: msgspec.json.Decoder(model) for model in REQUEST_MODELS}
+
+RequestT = TypeVar('RequestT', bound=msgspec.Struct)
+
+async def parse_body(request: Request, model: Type[RequestT]) -> RequestT:
+    """Decode and validate a JSON request body, answering 422 when it does not match"""
+    try:
+        return cast(RequestT, _DECODERS[model].decode(await request.body()))
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def body_doc(model: type) -> Dict[str, Any]:
+    """OpenAPI fragment documenting a route's request body (the model is not a FastAPI parameter)"""
+    return {'requestBody': {'required': True, 'content': {'application/json': {
+        'schema': {'$ref': f'#/components/schemas/{model.__name__}'}}}}}
+
+async def run_tool(func: Callable[..., Dict[str, Any]], **kwargs: Any) -> OrjsonResponse:
+    """
+    Run a blocking tool call in a worker thread (keeping the event loop free for
+    concurrent requests) and return its result as a ready-made response, which
+    skips FastAPI's per-request jsonable_encoder walk over the result dict
+    """
+    return OrjsonResponse(await asyncio.to_thread(func, **kwargs))
+
+@api.post('/analyze', operation_id='analyze_code', openapi_extra=body_doc(AnalyzeRequest))
+async def analyze_code(request: Request) -> OrjsonResponse:
+    '''Analyze Python code for errors and warnings'''
+    data = await parse_body(request, AnalyzeRequest)
+    return await run_tool(
+        _require_tools().analyze_code,
+        code=data.code,
+        file_name=data.fileName,
+        python_version=data.pythonVersion,
+        limit=data.limit
+    )
+
+@api.post('/symbols', operation_id='get_symbols', openapi_extra=body_doc(SymbolsRequest))
+async def get_symbols(request: Request) -> OrjsonResponse:
+    '''Extract symbols (classes, functions, variables) from Python code'''
+    data = await parse_body(request, SymbolsRequest)
+    return await run_tool(
+        _require_tools().get_symbols,
+        code=data.code,
+        file_name=data.fileName,
+        filter=data.filter,
+        limit=data.limit
+    )
+
+@api.post('/format', operation_id='format_code', openapi_extra=body_doc(FormatRequest))
+async def format_code(request: Request) -> OrjsonResponse:
+    '''Format Python code using black formatter'''
+    data = await parse_body(request, FormatRequest)
+    return await run_tool(_require_tools().format_code, code=data.code)
+
+@api.post('/metrics', operation_id='calculate_metrics', openapi_extra=body_doc(MetricsRequest))
+async def calculate_metrics(request: Request) -> OrjsonResponse:
+    '''Calculate code metrics including cyclomatic complexity'''
+    data = await parse_body(request, MetricsRequest)
+    return await run_tool(
+        _require_tools().calculate_metrics,
+        code=data.code,
+        file_name=data.fileName
+    )
+
+@api.post('/type-check', operation_id='type_check', openapi_extra=body_doc(DiagnosticsRequest))
+async def type_check(request: Request) -> OrjsonResponse:
+    '''Run static type checking using mypy'''
+    data = await parse_body(request, DiagnosticsRequest)
+    return await run_tool(
+        _require_tools().type_check,
+        code=data.code,
+        file_name=data.fileName,
+        limit=data.limit
+    )
+
+@api.post('/detect-dead-code', operation_id='detect_dead_code', openapi_extra=body_doc(DiagnosticsRequest))
+async def detect_dead_code(request: Request) -> OrjsonResponse:
+    '''Detect unused functions, classes, and variables using vulture'''
+    data = await parse_body(request, DiagnosticsRequest)
+    return await run_tool(
+        _require_tools().detect_dead_code,
+        code=data.code,
+        file_name=data.fileName,
+        limit=data.limit
+    )
+
+@api.post('/lint', operation_id='comprehensive_lint', openapi_extra=body_doc(DiagnosticsRequest))
+async def comprehensive_lint(request: Request) -> OrjsonResponse:
+    '''Run comprehensive linting using pylint'''
+    data = await parse_body(request, DiagnosticsRequest)
+    return await run_tool(
+        _require_tools().comprehensive_lint,
+        code=data.code,
+        file_name=data.fileName,
+        limit=data.limit
+    )
+
+def stream_tool(func: Callable[..., Iterable[Dict[str, Any]]], **kwargs: Any) -> StreamingResponse:
+    """
+    Send each item a streaming tool call yields as one NDJSON line; Starlette
+    drains the sync generator in its threadpool, so the call itself (which may
+    run the whole analysis before yielding) stays off the event loop as well
+    """
+    def lines() -> Iterator[bytes]:
+        for item in func(**kwargs):
+            yield orjson.dumps(item) + b'\n'
+
+    return StreamingResponse(lines(), media_type='application/x-ndjson')
+
+@api.post('/type-check/stream', operation_id='type_check_stream', openapi_extra=body_doc(StreamRequest))
+async def type_check_stream(request: Request) -> StreamingResponse:
+    '''Run static type checking using mypy, one NDJSON line per diagnostic plus a summary line'''
+    data = await parse_body(request, StreamRequest)
+    return stream_tool(
+        _require_tools().type_check_stream,
+        code=data.code,
+        file_name=data.fileName
+    )
+
+@api.post('/detect-dead-code/stream', operation_id='detect_dead_code_stream', openapi_extra=body_doc(StreamRequest))
+async def detect_dead_code_stream(request: Request) -> StreamingResponse:
+    '''Detect unused code using vulture, one NDJSON line per item plus a summary line'''
+    data = await parse_body(request, StreamRequest)
+    return stream_tool(
+        _require_tools().detect_dead_code_stream,
+        code=data.code,
+        file_name=data.fileName
+    )
+
+@api.post('/lint/stream', operation_id='comprehensive_lint_stream', openapi_extra=body_doc(StreamRequest))
+async def comprehensive_lint_stream(request: Request) -> StreamingResponse:
+    '''Run pylint, sending each diagnostic as an NDJSON line as soon as it is reported'''
+    data = await parse_body(request, StreamRequest)
+    return stream_tool(
+        _require_tools().comprehensive_lint_stream,
+        code=data.code,
+        file_name=data.fileName
+    )
+
+@api.post('/completions', operation_id='get_completions', openapi_extra=body_doc(CompletionsRequest))
+async def get_completions(request: Request) -> OrjsonResponse:
+    '''Get code completions at a specific position using jedi'''
+    data = await parse_body(request, CompletionsRequest)
+    return await run_tool(
+        _require_tools().get_completions,
+        code=data.code,
+        line=data.line,
+        column=data.column,
+        file_name=data.fileName,
+        limit=data.limit
+    )
+
+@api.post('/format-autopep8', operation_id='format_autopep8', openapi_extra=body_doc(Autopep8Request))
+async def format_autopep8(request: Request) -> OrjsonResponse:
+    '''Format Python code using autopep8 as an alternative to black'''
+    data = await parse_body(request, Autopep8Request)
+    return await run_tool(
+        _require_tools().format_with_autopep8,
+        code=data.code,
+        max_line_length=data.maxLineLength
+    )
+
+@api.post('/analyze-all', operation_id='analyze_all', openapi_extra=body_doc(AnalyzeAllRequest))
+async def analyze_all(request: Request) -> OrjsonResponse:
+    '''Run several analyzers concurrently and return their results keyed by tool name'''
+    data = await parse_body(request, AnalyzeAllRequest)
+    unknown = [name for name in data.tools or () if name not in ANALYZE_ALL_TOOLS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown tools: {', '.join(unknown)}")
+
+    return await run_tool(
+        _require_tools().analyze_all,
+        code=data.code,
+        file_name=data.fileName,
+        python_version=data.pythonVersion,
+        tools=data.tools
+    )
+
+@api.post('/analyze-many', operation_id='analyze_many', openapi_extra=body_doc(AnalyzeManyRequest))
+async def analyze_many(request: Request) -> OrjsonResponse:
+    '''Run analyzers over several files, type checking and linting them in one batch each'''
+    data = await parse_body(request, AnalyzeManyRequest)
+    unknown = [name for name in data.tools or () if name not in ANALYZE_ALL_TOOLS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown tools: {', '.join(unknown)}")
+    if len({f.fileName for f in data.files}) != len(data.files):
+        raise HTTPException(status_code=400, detail='File names must be unique')
+
+    return await run_tool(
+        _require_tools().analyze_many,
+        files=[(f.fileName, f.code) for f in data.files],
+        python_version=data.pythonVersion,
+        tools=data.tools
+    )
+
+app.include_router(api)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Python Analyzer HTTP Server')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Analyzer worker processes (default: 2, at most one per core; 0 = run in-process)')
+    args = parser.parse_args()
+    if args.workers is not None:
+        os.environ[WORKERS_ENV] = str(args.workers)
+
     print(f"Python Analyzer HTTP Server starting on port {SERVER_PORT}")
     print(f"OpenAPI documentation available at: http://localhost:{SERVER_PORT}/description")
     print(f"Swagger UI available at: http://localhost:{SERVER_PORT}/docs")
-    app.run(host='0.0.0.0', port=SERVER_PORT, debug=False)
+    uvicorn.run(app, host='0.0.0.0', port=SERVER_PORT)
@@ -0,0 +1,109 @@
+"""Parsed-AST cache shared by the analyzer entry points"""
+import ast
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Union
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+
+def source_key(code: str) -> bytes:
+    """Return a 128-bit digest of the source, using xxh3 when available"""
+    data = code.encode('utf-8', 'surrogatepass')
+    if HAS_XXHASH:
+        return xxhash.xxh3_128_digest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _syntax_error_for(error: SyntaxError, file_name: str) -> SyntaxError:
+    """Return a fresh copy of a cached parse failure reported against file_name"""
+    return type(error)(error.msg, (file_name, error.lineno, error.offset, error.text,
+                                   error.end_lineno, error.end_offset))
+
+
+class AstCache:
+    """Thread-safe LRU cache of parsed modules (or parse failures) keyed by source digest"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # Code that does not parse is cached too: editors send incomplete code
+        # often, and every analyzer would otherwise re-parse it just to fail again
+        self._trees: 'OrderedDict[bytes, Union[ast.Module, SyntaxError]]' = OrderedDict()
+        # Parses in progress: concurrent callers (analyze_all's threads) wait
+        # for the first one instead of parsing the same source again
+        self._pending: Dict[bytes, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def get(self, code: str, file_name: str = "<unknown>") -> ast.Module:
+        """
+        Return the parsed module for the source, parsing it on a miss
+
+        Args:
+            code: Python source code
+            file_name: File name reported in SyntaxError
+
+        Returns:
+            The parsed module; shared between callers, so it must not be mutated
+
+        Raises:
+            SyntaxError: If the code does not parse
+        """
+        key = source_key(code)
+
+        while True:
+            with self._lock:
+                entry = self._trees.get(key)
+                if entry is not None:
+                    self._trees.move_to_end(key)
+                    self.hits += 1
+                    break
+                pending = self._pending.get(key)
+                if pending is None:
+                    self.misses += 1
+                    self._pending[key] = threading.Event()
+                    break
+            # Another thread is parsing this source; use its result
+            pending.wait()
+
+        if entry is None:
+            try:
+                entry = ast.parse(code, filename=file_name)
+            except SyntaxError as e:
+                entry = e
+            finally:
+                with self._lock:
+                    if entry is not None:
+                        self._trees[key] = entry
+                        while len(self._trees) > self.maxsize:
+                            self._trees.popitem(last=False)
+                    self._pending.pop(key).set()
+
+        if isinstance(entry, SyntaxError):
+            raise _syntax_error_for(entry, file_name)
+        return entry
+
+    def clear(self) -> None:
+        """Drop all cached trees and reset the counters"""
+        with self._lock:
+            self._trees.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._trees),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,84 @@
+"""Result cache for analyzer calls keyed by code content"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+from .ast_cache import source_key
+
+
+class ResultCache:
+    """Thread-safe LRU cache of tool results with hit/miss counters"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, tool_name: str, code: str, args: Tuple,
+                       compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the cached result for a tool call, computing it on a miss
+
+        Args:
+            tool_name: Name of the tool being invoked
+            code: Source code the tool runs on
+            args: Normalized (hashable) remaining arguments
+            compute: Callable producing the result on a cache miss
+
+        Returns:
+            The tool result; shared between callers, so it must not be mutated
+        """
+        key = (tool_name, source_key(code), args)
+
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        # Run the analyzer outside the lock so other requests are not blocked
+        result = compute()
+        self._store(key, result)
+        return result
+
+    def put(self, tool_name: str, code: str, args: Tuple, result: Dict[str, Any]) -> None:
+        """
+        Store a result that is known without running the tool
+
+        Args:
+            tool_name: Name of the tool the result is for
+            code: Source code the result is for
+            args: Normalized (hashable) remaining arguments
+            result: The tool result; must not be mutated afterwards
+        """
+        self._store((tool_name, source_key(code), args), result)
+
+    def _store(self, key: Hashable, result: Dict[str, Any]) -> None:
+        """Insert or refresh an entry, evicting the least recently used ones"""
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
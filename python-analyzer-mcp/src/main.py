@@ -1,18 +1,26 @@
 #!/usr/bin/env python3
 """Python Analyzer MCP Server - Main entry point"""
 import asyncio
-import json
+from collections.abc import Awaitable, Callable
+import orjson
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
+from mcp.types import ListToolsResult, Tool, TextContent
 
 from .tools import PythonTools
 
-# Create the Python tools instance
-py_tools = PythonTools()
+# Created in main() so worker processes that re-import this module stay light
+py_tools: PythonTools | None = None
 
-# Define the available tools
-tools: list[Tool] = [
+
+def _require_tools() -> PythonTools:
+    """Return the server's PythonTools (tools are only called after main() created it)"""
+    assert py_tools is not None, "PythonTools is created in main()"
+    return py_tools
+
+
+# Define the available tools (frozen; the list never changes at runtime)
+TOOLS: tuple[Tool, ...] = (
     Tool(
         name="analyze_code",
         description="Analyze Python code for errors, warnings, and compatibility issues with version awareness",
@@ -30,6 +38,10 @@ tools: list[Tool] = [
                 "pythonVersion": {
                     "type": "string",
                     "description": "Target Python version (e.g., '3.8', '3.10', 'auto'). Default: 'auto'"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Optional maximum number of diagnostics to return (counts still cover all of them)"
                 }
             },
             "required": ["code"]
@@ -52,6 +64,10 @@ tools: list[Tool] = [
                 "filter": {
                     "type": "string",
                     "description": "Optional filter: 'class', 'function', 'variable', or 'all'"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Optional maximum number of symbols to return (count still covers all of them)"
                 }
             },
             "required": ["code"]
@@ -102,6 +118,10 @@ tools: list[Tool] = [
                 "fileName": {
                     "type": "string",
                     "description": "Optional file name for context"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Optional maximum number of diagnostics to return (counts still cover all of them)"
                 }
             },
             "required": ["code"]
@@ -120,6 +140,10 @@ tools: list[Tool] = [
                 "fileName": {
                     "type": "string",
                     "description": "Optional file name for context"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Optional maximum number of unused code items to return (count still covers all of them)"
                 }
             },
             "required": ["code"]
@@ -138,6 +162,10 @@ tools: list[Tool] = [
                 "fileName": {
                     "type": "string",
                     "description": "Optional file name for context"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Optional maximum number of diagnostics to return (counts still cover all of them)"
                 }
             },
             "required": ["code"]
@@ -160,11 +188,77 @@ tools: list[Tool] = [
                 "column": {
                     "type": "integer",
                     "description": "Column number (0-based)"
+                },
+                "fileName": {
+                    "type": "string",
+                    "description": "Optional file name of the buffer; repeated requests for the same file are parsed incrementally, and a request superseded by a newer one for the same file within 20 ms is answered with no completions and superseded set to true instead of being run"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Optional maximum number of completions (at most 50 are returned)"
                 }
             },
             "required": ["code", "line", "column"]
         }
     ),
+    Tool(
+        name="analyze_all",
+        description="Run several analyzers concurrently (analysis, symbols, metrics, type check, dead code, lint) and return all results in one response",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "Python code to analyze"
+                },
+                "fileName": {
+                    "type": "string",
+                    "description": "Optional file name for context"
+                },
+                "pythonVersion": {
+                    "type": "string",
+                    "description": "Target Python version (e.g., '3.8', '3.10', 'auto'). Default: 'auto'"
+                },
+                "tools": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional subset of analyzers: 'analyze_code', 'get_symbols', 'calculate_metrics', 'type_check', 'detect_dead_code', 'comprehensive_lint'. Default: all"
+                }
+            },
+            "required": ["code"]
+        }
+    ),
+    Tool(
+        name="analyze_many",
+        description="Run analyzers over several files at once; type checking and linting run as one batch for all files",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "files": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "fileName": {"type": "string"},
+                            "code": {"type": "string"}
+                        },
+                        "required": ["fileName", "code"]
+                    },
+                    "description": "Files to analyze; file names must be unique"
+                },
+                "pythonVersion": {
+                    "type": "string",
+                    "description": "Target Python version (e.g., '3.8', '3.10', 'auto'). Default: 'auto'"
+                },
+                "tools": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional subset of analyzers: 'analyze_code', 'get_symbols', 'calculate_metrics', 'type_check', 'detect_dead_code', 'comprehensive_lint'. Default: all"
+                }
+            },
+            "required": ["files"]
+        }
+    ),
     Tool(
         name="format_with_autopep8",
         description="Format Python code using autopep8 as an alternative to black",
@@ -183,16 +277,130 @@ tools: list[Tool] = [
             "required": ["code"]
         }
     )
-]
+)
+
+# Built once and returned as-is: some clients list tools before every call
+_LIST_TOOLS_RESULT = ListToolsResult(tools=list(TOOLS))
+
+# Map each tool name to a handler that unpacks its MCP arguments; every call
+# runs off the event loop, since the pooled tools block until a worker answers
+_DISPATCH: dict[str, Callable[[dict], Awaitable[dict]]] = {
+    "analyze_code": lambda arguments: asyncio.to_thread(
+        _require_tools().analyze_code,
+        code=arguments["code"],
+        file_name=arguments.get("fileName"),
+        python_version=arguments.get("pythonVersion", "auto"),
+        limit=arguments.get("limit")
+    ),
+    "get_symbols": lambda arguments: asyncio.to_thread(
+        _require_tools().get_symbols,
+        code=arguments["code"],
+        file_name=arguments.get("fileName"),
+        filter=arguments.get("filter"),
+        limit=arguments.get("limit")
+    ),
+    "format_code": lambda arguments: asyncio.to_thread(
+        _require_tools().format_code,
+        code=arguments["code"]
+    ),
+    "calculate_metrics": lambda arguments: asyncio.to_thread(
+        _require_tools().calculate_metrics,
+        code=arguments["code"],
+        file_name=arguments.get("fileName")
+    ),
+    "type_check": lambda arguments: asyncio.to_thread(
+        _require_tools().type_check,
+        code=arguments["code"],
+        file_name=arguments.get("fileName"),
+        limit=arguments.get("limit")
+    ),
+    "detect_dead_code": lambda arguments: asyncio.to_thread(
+        _require_tools().detect_dead_code,
+        code=arguments["code"],
+        file_name=arguments.get("fileName"),
+        limit=arguments.get("limit")
+    ),
+    "comprehensive_lint": lambda arguments: asyncio.to_thread(
+        _require_tools().comprehensive_lint,
+        code=arguments["code"],
+        file_name=arguments.get("fileName"),
+        limit=arguments.get("limit")
+    ),
+    "format_with_autopep8": lambda arguments: asyncio.to_thread(
+        _require_tools().format_with_autopep8,
+        code=arguments["code"],
+        max_line_length=arguments.get("maxLineLength")
+    ),
+}
+
+
+async def analyze_all(arguments: dict) -> dict:
+    """Run the selected analyzers concurrently, off the event loop"""
+    return await asyncio.to_thread(
+        _require_tools().analyze_all,
+        code=arguments["code"],
+        file_name=arguments.get("fileName"),
+        python_version=arguments.get("pythonVersion"),
+        tools=arguments.get("tools")
+    )
+
+
+async def analyze_many(arguments: dict) -> dict:
+    """Run the selected analyzers over several files, off the event loop"""
+    return await asyncio.to_thread(
+        _require_tools().analyze_many,
+        files=[(f["fileName"], f["code"]) for f in arguments["files"]],
+        python_version=arguments.get("pythonVersion"),
+        tools=arguments.get("tools")
+    )
+
+
+# Editors send a completion request per keystroke; a request for a named file
+# waits this long (seconds) and is dropped if a newer one for the file arrives
+COMPLETION_DEBOUNCE = 0.02
+
+# Newest pending completion request per file name
+_latest_completion: dict[str, object] = {}
+
+
+async def get_completions(arguments: dict) -> dict:
+    """Complete off the event loop, skipping requests superseded by a newer one for the same file"""
+    file_name = arguments.get("fileName")
+    if file_name is not None:
+        request = object()
+        _latest_completion[file_name] = request
+        await asyncio.sleep(COMPLETION_DEBOUNCE)
+        if _latest_completion.get(file_name) is not request:
+            return {
+                "success": True,
+                "completions": [],
+                "count": 0,
+                "superseded": True
+            }
+        del _latest_completion[file_name]
+
+    return await asyncio.to_thread(
+        _require_tools().get_completions,
+        code=arguments["code"],
+        line=arguments["line"],
+        column=arguments["column"],
+        file_name=file_name,
+        limit=arguments.get("limit")
+    )
+
+
+_DISPATCH["analyze_all"] = analyze_all
+_DISPATCH["analyze_many"] = analyze_many
+_DISPATCH["get_completions"] = get_completions
 
 # Create the MCP server
 app = Server("python-analyzer-mcp")
 
 
 @app.list_tools()
-async def list_tools() -> list[Tool]:
+async def list_tools() -> ListToolsResult:
     """List available tools"""
-    return tools
+    return _LIST_TOOLS_RESULT
 
 
 @app.call_tool()
@@ -200,76 +408,38 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls"""
 
     try:
-        if name == "analyze_code":
-            result = py_tools.analyze_code(
-                code=arguments["code"],
-                file_name=arguments.get("fileName"),
-                python_version=arguments.get("pythonVersion", "auto")
-            )
-        elif name == "get_symbols":
-            result = py_tools.get_symbols(
-                code=arguments["code"],
-                file_name=arguments.get("fileName"),
-                filter=arguments.get("filter")
-            )
-        elif name == "format_code":
-            result = py_tools.format_code(
-                code=arguments["code"]
-            )
-        elif name == "calculate_metrics":
-            result = py_tools.calculate_metrics(
-                code=arguments["code"],
-                file_name=arguments.get("fileName")
-            )
-        elif name == "type_check":
-            result = py_tools.type_check(
-                code=arguments["code"],
-                file_name=arguments.get("fileName")
-            )
-        elif name == "detect_dead_code":
-            result = py_tools.detect_dead_code(
-                code=arguments["code"],
-                file_name=arguments.get("fileName")
-            )
-        elif name == "comprehensive_lint":
-            result = py_tools.comprehensive_lint(
-                code=arguments["code"],
-                file_name=arguments.get("fileName")
-            )
-        elif name == "get_completions":
-            result = py_tools.get_completions(
-                code=arguments["code"],
-                line=arguments["line"],
-                column=arguments["column"]
-            )
-        elif name == "format_with_autopep8":
-            result = py_tools.format_with_autopep8(
-                code=arguments["code"],
-                max_line_length=arguments.get("maxLineLength")
-            )
+        handler = _DISPATCH.get(name)
+        if handler is not None:
+            result = await handler(arguments)
         else:
             result = {
                 "success": False,
                 "error": f"Unknown tool: {name}"
             }
 
+        # orjson serializes in C and handles the model dataclasses natively
         return [TextContent(
             type="text",
-            text=json.dumps(result, indent=2)
+            text=orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
         )]
 
     except Exception as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=orjson.dumps({
                 "success": False,
                 "error": str(e)
-            }, indent=2)
+            }, option=orjson.OPT_INDENT_2).decode()
         )]
 
 
-async def main():
+async def main() -> None:
     """Main entry point"""
+    global py_tools
+    # One client talks to a stdio server, so a single analyzer worker process
+    # (one mypy daemon) is enough
+    py_tools = PythonTools(workers=1)
+
     async with stdio_server() as (read_stream, write_stream):
         await app.run(
             read_stream,
@@ -1,6 +1,6 @@
 """Models package for Python analyzer"""
-from .diagnostic_info import DiagnosticInfo
-from .symbol_info import SymbolInfo
+from .diagnostic_info import DiagnosticInfo, Severity
+from .symbol_info import SymbolInfo, SymbolKind
 from .code_metrics import CodeMetrics
 
-__all__ = ['DiagnosticInfo', 'SymbolInfo', 'CodeMetrics']
+__all__ = ['DiagnosticInfo', 'Severity', 'SymbolInfo', 'SymbolKind', 'CodeMetrics']
@@ -1,8 +1,9 @@
 """Code metrics model"""
 from dataclasses import dataclass
+from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CodeMetrics:
     """Code quality metrics"""
     lines_of_code: int
@@ -10,7 +11,7 @@ class CodeMetrics:
     blank_lines: int
     total_lines: int
     cyclomatic_complexity: int
-    maintainability_index: float
+    maintainability_index: Optional[float]  # None when radon is not installed
     function_count: int
     class_count: int
     average_complexity: float = 0.0
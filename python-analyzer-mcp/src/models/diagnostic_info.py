@@ -1,9 +1,29 @@
 """Data models for Python analyzer"""
 from dataclasses import dataclass
+from enum import IntEnum
+from sys import intern
 from typing import Optional
 
 
-@dataclass
+class Severity(IntEnum):
+    """Diagnostic severity (reported to clients by its lowercase name)"""
+    ERROR = 0
+    WARNING = 1
+    INFO = 2
+    HINT = 3
+
+    # Lowercase name used in JSON output ('error', 'warning', ...)
+    label: str
+
+
+# A plain member attribute: read once per serialized diagnostic, where a
+# property call would cost more than building the rest of the dict
+for _severity in Severity:
+    _severity.label = intern(_severity.name.lower())
+del _severity
+
+
+@dataclass(slots=True, frozen=True)
 class DiagnosticInfo:
     """Information about a diagnostic (error, warning, etc.)"""
     message: str
@@ -12,4 +32,11 @@ class DiagnosticInfo:
     file: Optional[str] = None
     line: Optional[int] = None
     column: Optional[int] = None
-    severity: str = "error"
+    severity: Severity = Severity.ERROR
+
+    def __post_init__(self) -> None:
+        # Categories and codes come from small fixed vocabularies;
+        # interning makes every diagnostic share one string object per value
+        object.__setattr__(self, 'category', intern(self.category))
+        if self.code is not None:
+            object.__setattr__(self, 'code', intern(self.code))
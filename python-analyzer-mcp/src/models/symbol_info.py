@@ -1,16 +1,43 @@
 """Symbol information model"""
 from dataclasses import dataclass
-from typing import Optional
+from enum import IntEnum
+from sys import intern
+from typing import Optional, Tuple
 
 
-@dataclass
+class SymbolKind(IntEnum):
+    """Kind of code symbol (reported to clients by its lowercase name)"""
+    CLASS = 1
+    FUNCTION = 2
+    METHOD = 3
+    VARIABLE = 4
+    IMPORT = 5
+
+    # Lowercase name used in JSON output and filters ('class', 'function', ...)
+    label: str
+
+    @classmethod
+    def from_label(cls, label: str) -> Optional['SymbolKind']:
+        """Return the kind with the given lowercase name, or None if there is none"""
+        kind = cls.__members__.get(label.upper())
+        # Names are matched exactly, so 'Class' or 'FUNCTION' is no kind at all
+        return kind if kind is not None and kind.label == label else None
+
+
+# A plain member attribute rather than a property: it is read for every symbol
+for _kind in SymbolKind:
+    _kind.label = intern(_kind.name.lower())
+del _kind
+
+
+@dataclass(slots=True, frozen=True)
 class SymbolInfo:
     """Information about a code symbol (class, function, variable, etc.)"""
     name: str
-    kind: str  # 'class', 'function', 'method', 'variable', 'import'
+    kind: SymbolKind
     line: int
     column: int
     type_annotation: Optional[str] = None
     container_name: Optional[str] = None
     is_async: bool = False
-    decorators: Optional[list[str]] = None
+    decorators: Optional[Tuple[str, ...]] = None
@@ -0,0 +1,146 @@
+"""Single-pass AST visitor computing structural code metrics"""
+import ast
+from typing import Any, Callable, Dict, List, Tuple, Type, TypedDict, Union, cast
+
+# Scope kinds while walking the tree
+_MODULE, _CLASS, _FUNCTION = 0, 1, 2
+
+
+class StructureMetrics(TypedDict):
+    """Metrics MetricsVisitor.result() returns (CodeMetrics fields of the same names)"""
+    function_count: int
+    class_count: int
+    cyclomatic_complexity: int
+    average_complexity: float
+
+
+class MetricsVisitor(ast.NodeVisitor):
+    """
+    Count classes and functions and compute cyclomatic complexity in one walk
+
+    Complexity follows radon's rules so results match radon's cc_visit: module
+    level functions and classes (with their methods) are the scored blocks,
+    closures and nested classes are walked but not scored, and decorators,
+    arguments and base classes are not counted.
+    """
+
+    def __init__(self) -> None:
+        self.function_count = 0
+        self.class_count = 0
+        # Complexity of module level functions, and (complexity, methods) of classes
+        self._functions: List[int] = []
+        self._classes: List[Tuple[int, List[int]]] = []
+        self._scope = _MODULE
+        self._complexity = 0  # decision points in the current scope
+        self._methods: List[int] = []
+
+    def visit_FunctionDef(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> None:
+        self.function_count += 1
+
+        outer = self._scope, self._complexity
+        self._scope, self._complexity = _FUNCTION, 0
+        for stmt in node.body:
+            self.visit(stmt)
+        complexity = self._complexity + 1
+        self._scope, self._complexity = outer
+
+        if self._scope == _MODULE:
+            self._functions.append(complexity)
+        elif self._scope == _CLASS:
+            self._methods.append(complexity)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.class_count += 1
+
+        outer = self._scope, self._complexity, self._methods
+        self._scope, self._complexity, self._methods = _CLASS, 0, []
+        for stmt in node.body:
+            self.visit(stmt)
+        methods = self._methods
+        complexity = self._complexity + sum(methods) + 1
+        self._scope, self._complexity, self._methods = outer
+
+        if self._scope == _MODULE:
+            self._classes.append((complexity, methods))
+
+    def visit_Assert(self, node: ast.Assert) -> None:
+        # Counted as one branch; its test expression is not walked
+        self._complexity += 1
+
+    def visit(self, node: ast.AST) -> None:
+        # Dispatch on the node type directly; NodeVisitor.visit builds a method
+        # name and looks it up for every node in the tree
+        handler = _HANDLERS.get(type(node))
+        if handler is None:
+            self.generic_visit(node)
+        else:
+            handler(self, node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        # Compared by identity for speed; the casts tell mypy what each test implies
+        node_type = type(node)
+        if node_type is ast.If or node_type is ast.IfExp:
+            self._complexity += 1
+        elif node_type is ast.BoolOp:
+            self._complexity += len(cast(ast.BoolOp, node).values) - 1
+        elif node_type is ast.For or node_type is ast.While or node_type is ast.AsyncFor:
+            self._complexity += 1 + bool(cast(Union[ast.For, ast.While, ast.AsyncFor], node).orelse)
+        elif node_type is ast.Try:
+            try_node = cast(ast.Try, node)
+            self._complexity += len(try_node.handlers) + bool(try_node.orelse)
+        elif node_type is ast.comprehension:
+            self._complexity += len(cast(ast.comprehension, node).ifs) + 1
+        elif node_type is ast.Match:
+            # A catch-all case (`case _` or a bare capture) is the "else" branch
+            cases = cast(ast.Match, node).cases
+            has_default = any(getattr(case.pattern, 'pattern', False) is None for case in cases)
+            self._complexity += max(0, len(cases) - has_default)
+        for child in ast.iter_child_nodes(node):
+            self.visit(child)
+
+    def _block_complexities(self) -> List[int]:
+        """Complexity of every scored block: functions, classes and their methods"""
+        blocks = list(self._functions)
+        for complexity, methods in self._classes:
+            if methods:
+                # A class scores the average of its methods (plus one if it has several)
+                blocks.append(int(complexity / len(methods)) + (len(methods) > 1))
+            else:
+                blocks.append(complexity)
+            blocks.extend(methods)
+        return blocks
+
+    @property
+    def total_complexity(self) -> int:
+        """Whole-module complexity, as radon's ComplexityVisitor.total_complexity"""
+        return (1 + self._complexity
+                + sum(self._functions) - len(self._functions)
+                + sum(complexity for complexity, _ in self._classes) - len(self._classes))
+
+    def result(self) -> StructureMetrics:
+        """
+        Return the collected metrics
+
+        Returns:
+            function_count, class_count, cyclomatic_complexity (sum over blocks)
+            and average_complexity (per block)
+        """
+        blocks = self._block_complexities()
+        total = sum(blocks)
+        return {
+            'function_count': self.function_count,
+            'class_count': self.class_count,
+            'cyclomatic_complexity': total,
+            'average_complexity': total / len(blocks) if blocks else 0.0
+        }
+
+
+# Node types with their own visit method
+_HANDLERS: Dict[Type[ast.AST], Callable[[MetricsVisitor, Any], None]] = {
+    ast.FunctionDef: MetricsVisitor.visit_FunctionDef,
+    ast.AsyncFunctionDef: MetricsVisitor.visit_FunctionDef,
+    ast.ClassDef: MetricsVisitor.visit_ClassDef,
+    ast.Assert: MetricsVisitor.visit_Assert,
+}
@@ -1,67 +1,309 @@
 """Python code analyzer with version awareness"""
 import ast
+import atexit
+import copy
+import functools
+import io
 import re
+import shutil
 import sys
+import subprocess
 import tempfile
+import threading
+import time
+import tokenize
 import os
-from typing import List, Dict, Tuple, Optional
-from io import StringIO
-from contextlib import redirect_stdout, redirect_stderr
-
-try:
-    import black
-    from black import Mode as BlackMode
-    HAS_BLACK = True
-except ImportError:
-    HAS_BLACK = False
-
-try:
-    from radon.complexity import cc_visit
-    from radon.metrics import mi_visit
-    from radon.raw import analyze
-    HAS_RADON = True
-except ImportError:
-    HAS_RADON = False
-
-try:
-    import pyflakes.api
-    import pyflakes.reporter
-    HAS_PYFLAKES = True
-except ImportError:
-    HAS_PYFLAKES = False
-
-try:
-    from mypy import api as mypy_api
-    HAS_MYPY = True
-except ImportError:
-    HAS_MYPY = False
-
-try:
-    import vulture
-    HAS_VULTURE = True
-except ImportError:
-    HAS_VULTURE = False
-
-try:
-    from pylint.lint import Run as PylintRun
-    from pylint.reporters.text import TextReporter
-    HAS_PYLINT = True
-except ImportError:
-    HAS_PYLINT = False
-
-try:
-    import jedi
-    HAS_JEDI = True
-except ImportError:
-    HAS_JEDI = False
-
-try:
+import queue
+from typing import TYPE_CHECKING, Any, FrozenSet, Iterator, List, Dict, Tuple, Optional, Union, cast
+from contextlib import contextmanager, redirect_stdout, redirect_stderr
+from importlib.util import find_spec
+
+# Optional backends are only located here; each is imported by the first call
+# that needs it, so a server pays import time and memory only for tools in use
+HAS_BLACK = find_spec('black') is not None
+HAS_RADON = find_spec('radon') is not None
+HAS_PYFLAKES = find_spec('pyflakes') is not None
+HAS_MYPY = find_spec('mypy') is not None
+HAS_VULTURE = find_spec('vulture') is not None
+HAS_PYLINT = find_spec('pylint') is not None and find_spec('astroid') is not None
+HAS_JEDI = find_spec('jedi') is not None
+HAS_AUTOPEP8 = find_spec('autopep8') is not None
+
+from ..ast_cache import AstCache
+from ..models import DiagnosticInfo, Severity, SymbolInfo, SymbolKind, CodeMetrics
+from .metrics_visitor import MetricsVisitor
+from .raw_metrics import analyze_raw
+
+if TYPE_CHECKING:
+    import argparse
+
+    from pylint.lint import PyLinter
+    from pylint.message import Message
+    from pylint.reporters import BaseReporter
+
+# mypy and pylint keep process-global state and are not thread-safe; each
+# backend runs one call at a time while different backends may overlap
+_MYPY_LOCK = threading.Lock()
+_PYLINT_LOCK = threading.Lock()
+# Cached jedi Scripts are shared between requests and are not thread-safe
+_JEDI_LOCK = threading.Lock()
+
+# mypy output options, shared by the daemon and the in-process fallback
+MYPY_FLAGS = ['--show-column-numbers', '--no-error-summary']
+# The mypy daemon exits after this many idle seconds (and is restarted on demand)
+DMYPY_IDLE_TIMEOUT = 600
+# "<file>:line:col: severity: message" lines (file is "<string>" for mypy -c)
+_RE_MYPY_LINE = re.compile(r'^(?:<string>|.+?\.py):(\d+):(\d+): (\w+): (.*)$', re.MULTILINE)
+# The same, keeping the file (a batch run checks several files at once)
+_RE_MYPY_FILE_LINE = re.compile(r'^(.+?\.py):(\d+):(\d+): (\w+): (.*)$', re.MULTILINE)
+# pylint checks that compare modules with each other (duplicate code, import
+# cycles); a batch of unrelated files must report what linting each alone would
+_PYLINT_CROSS_MODULE = frozenset({'R0401', 'R0801'})
+
+# Version detection patterns, compiled once
+_RE_SHEBANG_PY = re.compile(r'python(\d+)\.?(\d+)?')
+_RE_REQUIRES_PY = re.compile(r'python[>=<]+(\d+)\.(\d+)', re.IGNORECASE)
+
+# Syntax features that imply a minimum Python version, newest first
+_FEATURE_VERSIONS = (
+    ('match', (3, 10)),
+    ('union_pipe', (3, 10)),  # X | Y in annotations (PEP 604)
+    ('walrus', (3, 8)),
+    ('fstring', (3, 6)),
+    ('async', (3, 5)),
+    ('print_call', (3, 0)),
+    ('print_stmt', (2, 7)),
+)
+_FEATURE_NODE_TYPES: Dict[type, str] = {
+    ast.Match: 'match',
+    ast.NamedExpr: 'walrus',
+    ast.JoinedStr: 'fstring',
+    ast.AsyncFunctionDef: 'async',
+    ast.AsyncFor: 'async',
+    ast.AsyncWith: 'async',
+    ast.Await: 'async',
+}
+# What _tree_features does with each node type: a feature name to record, or
+# one of the checks below; one lookup per node, and most nodes have no entry
+_CALL, _BINOP, _ANNOTATED, _FUNCTION, _ASYNC_FUNCTION, _IMPORT_FROM = range(6)
+_TREE_FEATURE_ROLES: Dict[type, Union[str, int]] = {
+    **_FEATURE_NODE_TYPES,
+    ast.Call: _CALL,
+    ast.BinOp: _BINOP,
+    ast.arg: _ANNOTATED,
+    ast.AnnAssign: _ANNOTATED,
+    ast.FunctionDef: _FUNCTION,
+    ast.AsyncFunctionDef: _ASYNC_FUNCTION,
+    ast.ImportFrom: _IMPORT_FROM,
+}
+# Tokens that never affect feature detection
+_SKIPPED_TOKENS = frozenset({tokenize.COMMENT, tokenize.NL, tokenize.INDENT, tokenize.DEDENT})
+_FSTRING_START = getattr(tokenize, 'FSTRING_START', None)  # Python 3.12+
+
+
+def _tree_features(tree: ast.Module) -> FrozenSet[str]:
+    """Return the version-relevant syntax features used in a parsed module"""
+    features = set()
+    annotations: List[ast.expr] = []
+    future_annotations = False
+    for node in ast.walk(tree):
+        role = _TREE_FEATURE_ROLES.get(type(node))
+        if role is None:
+            continue
+        # The role was looked up by exact type, so each cast below is to the node's own type
+        if type(role) is str:
+            features.add(role)
+        elif role == _CALL:
+            func = cast(ast.Call, node).func
+            if type(func) is ast.Name and func.id == 'print':
+                features.add('print_call')
+        elif role == _BINOP:
+            # Python 2's "print >>stream, ..." still parses, as a shift
+            binop = cast(ast.BinOp, node)
+            left = binop.left
+            if type(binop.op) is ast.RShift and type(left) is ast.Name and left.id == 'print':
+                features.add('print_stmt')
+        elif role == _ANNOTATED:
+            annotation = cast(Union[ast.arg, ast.AnnAssign], node).annotation
+            if annotation is not None:
+                annotations.append(annotation)
+        elif role == _IMPORT_FROM:
+            import_from = cast(ast.ImportFrom, node)
+            if import_from.module == '__future__':
+                future_annotations |= any(alias.name == 'annotations' for alias in import_from.names)
+        else:
+            if role == _ASYNC_FUNCTION:
+                features.add('async')
+            returns = cast(Union[ast.FunctionDef, ast.AsyncFunctionDef], node).returns
+            if returns is not None:
+                annotations.append(returns)
+
+    # Unevaluated annotations (PEP 563) may use X | Y on any Python 3.7+
+    if not future_annotations and any(
+            type(node) is ast.BinOp and type(node.op) is ast.BitOr
+            for annotation in annotations for node in ast.walk(annotation)):
+        features.add('union_pipe')
+    return frozenset(features)
+
+
+def _token_features(code: str) -> FrozenSet[str]:
+    """Return the version-relevant syntax features of code that does not parse, from its tokens"""
+    features = set()
+    line_head = None  # first token of the current logical line
+    position = 0      # index of the token within its logical line
+    prev_type, prev = tokenize.NEWLINE, ''
+    try:
+        for tok in tokenize.generate_tokens(io.StringIO(code).readline):
+            tok_type, string = tok.type, tok.string
+            if tok_type in _SKIPPED_TOKENS:
+                continue
+            if tok_type == tokenize.NEWLINE:
+                # match statements are lines headed by 'match' and ending in a colon
+                if line_head == 'match' and prev == ':':
+                    features.add('match')
+                line_head, position = None, 0
+                prev_type, prev = tok_type, string
+                continue
+
+            if position == 0:
+                line_head = string
+            elif prev_type == tokenize.NAME:
+                if prev == 'print':
+                    if string == '(':
+                        features.add('print_call')
+                    elif position == 1 and (tok_type in (tokenize.NAME, tokenize.NUMBER, tokenize.STRING)
+                                            or string == '>>'):
+                        features.add('print_stmt')
+                elif prev == 'async' and string in ('def', 'for', 'with'):
+                    features.add('async')
+                elif prev == 'await' and (tok_type in (tokenize.NAME, tokenize.NUMBER, tokenize.STRING)
+                                          or string in ('(', '[', '{')):
+                    features.add('async')
+
+            if tok_type == tokenize.OP and string == ':=':
+                features.add('walrus')
+            elif tok_type == tokenize.STRING:
+                if 'f' in string[:string.find(string[-1])].lower():  # string prefix
+                    features.add('fstring')
+            elif tok_type == _FSTRING_START:
+                features.add('fstring')
+
+            position += 1
+            prev_type, prev = tok_type, string
+    except (tokenize.TokenError, SyntaxError):
+        pass  # keep what was found before the code became untokenizable
+    return frozenset(features)
+
+# Node types that can produce a symbol; everything else is skipped by get_symbols
+_SYMBOL_NODE_TYPES = frozenset({ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef,
+                                ast.AnnAssign, ast.Assign})
+_SymbolNode = Union[ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef, ast.AnnAssign, ast.Assign]
+# Nodes that hold statements (directly or through handlers and match cases)
+_BLOCK_ITEM_TYPES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+# Constant types whose repr() is exactly what ast.unparse produces
+_REPR_CONSTANT_TYPES = (str, int, bool, type(None))
+
+
+def _fast_unparse(node: ast.expr) -> str:
+    """Return ast.unparse(node), short-cutting plain names, dotted names and literals"""
+    if type(node) is ast.Name:
+        return node.id
+    if type(node) is ast.Attribute and type(node.value) is ast.Name:
+        return f"{node.value.id}.{node.attr}"
+    if type(node) is ast.Constant and type(node.value) in _REPR_CONSTANT_TYPES:
+        return repr(node.value)
+    return ast.unparse(node)
+
+class _SymbolCollector(ast.NodeVisitor):
+    """
+    Collect the nodes that can define symbols, in the order ast.walk yields them
+
+    Only statement lists are descended into (expressions cannot contain
+    definitions), so names, constants and other expression leaves are never
+    visited. Nodes are recorded with their depth in pre-order; a stable sort by
+    depth then reproduces ast.walk's breadth-first order.
+    """
+
+    def __init__(self) -> None:
+        self._found: List[Tuple[int, _SymbolNode]] = []
+        self._depth = 0
+
+    def collect(self, tree: ast.Module) -> List[_SymbolNode]:
+        """Return the symbol-defining nodes of the tree in ast.walk order"""
+        self.visit(tree)
+        self._found.sort(key=lambda item: item[0])
+        return [node for _, node in self._found]
+
+    def generic_visit(self, node: ast.AST) -> None:
+        self._depth += 1
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if type(value) is list and value and isinstance(value[0], _BLOCK_ITEM_TYPES):
+                for child in value:
+                    if type(child) in _SYMBOL_NODE_TYPES:
+                        self._found.append((self._depth, cast(_SymbolNode, child)))
+                    self.generic_visit(child)
+        self._depth -= 1
+
+# Analyzers that need the source on disk write it under a RAM-backed tmpfs
+# where one exists, so temp files never touch a real disk
+SHM_TEMP_DIR = '/dev/shm/pyanalyzer'
+
+
+@functools.cache
+def analysis_temp_dir() -> str:
+    """Return the directory for analyzer temp files (tmpfs if available)"""
+    if os.path.isdir('/dev/shm'):
+        try:
+            os.makedirs(SHM_TEMP_DIR, mode=0o700, exist_ok=True)
+            if os.access(SHM_TEMP_DIR, os.W_OK):
+                return SHM_TEMP_DIR
+        except OSError:
+            pass
+    return tempfile.gettempdir()
+
+
+@functools.lru_cache(maxsize=8)
+def _autopep8_options(max_line_length: int) -> 'argparse.Namespace':
+    """Return parsed autopep8 options for a line length (fix_code re-parses a dict per call)"""
     import autopep8
-    HAS_AUTOPEP8 = True
-except ImportError:
-    HAS_AUTOPEP8 = False
 
-from ..models import DiagnosticInfo, SymbolInfo, CodeMetrics
+    options: 'argparse.Namespace' = autopep8.parse_args([''])
+    options.max_line_length = max_line_length
+    return options
+
+
+@contextmanager
+def _temp_source_file(code: str) -> Iterator[str]:
+    """Write the code once to a fresh temp module and yield its path, removing it afterwards"""
+    fd, path = tempfile.mkstemp(suffix='.py', dir=analysis_temp_dir())
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(code)
+        yield path
+    finally:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+@contextmanager
+def _temp_source_dir(codes: List[str]) -> Iterator[List[str]]:
+    """Write each code to its own module in a fresh temp directory and yield their paths"""
+    directory = tempfile.mkdtemp(dir=analysis_temp_dir())
+    try:
+        paths = []
+        for i, code in enumerate(codes):
+            path = os.path.join(directory, f'module_{i}.py')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(code)
+            paths.append(path)
+        yield paths
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
 
 
 class PythonAnalyzer:
@@ -78,18 +320,89 @@ class PythonAnalyzer:
         (3, 5): ['async/await', 'type hints'],
     }
 
-    def __init__(self):
-        self.current_version = sys.version_info[:2]
+    # Trivial program used to exercise every backend once at startup
+    WARM_UP_CODE = "import os\n\nPATH_SEP = os.sep\n"
+    # Methods warm_up runs on it, one per backend
+    WARM_UP_METHODS = ('analyze_code', 'get_symbols', 'calculate_metrics', 'format_code',
+                       'format_with_autopep8', 'type_check', 'detect_dead_code',
+                       'comprehensive_lint', 'get_completions')
+
+    def __init__(self) -> None:
+        self.current_version: Tuple[int, int] = sys.version_info[:2]
+        # Clients often run several tools on the same snippet; parse it once
+        self._ast_cache = AstCache(maxsize=256)
+        # Completion requests repeat on the same buffer at different positions
+        self._jedi_script: Optional['functools._lru_cache_wrapper[Any]'] = (
+            functools.lru_cache(maxsize=16)(self._create_jedi_script) if HAS_JEDI else None)
+        # One project/environment for every Script, created on the first completion
+        # (jedi would otherwise look up both, and rescan for stubs, per Script);
+        # pool workers neither complete nor warm up jedi, so they never start
+        # the environment's subprocess
+        self._jedi_project = None
+        self._jedi_environment = None
+        # (status file, checked source file) of this analyzer's mypy daemon, once
+        # started; the daemon keeps mypy's build (typeshed included) in memory
+        # between type checks
+        self._dmypy_files: Optional[Tuple[str, str]] = None
+        self._dmypy_mtime = 0
+        self._dmypy_unavailable = False
+        # Configured pylint linter, kept after the first lint (plugin loading and
+        # option parsing are most of the cost of a small lint)
+        self._pylinter: Optional['PyLinter'] = None
+
+    def _create_jedi_script(self, code: str, file_name: Optional[str]) -> Any:
+        """Create a jedi Script on the shared project and environment (call under _JEDI_LOCK)"""
+        import jedi
+
+        if self._jedi_environment is None:
+            self._jedi_project = jedi.Project(path=os.getcwd(), added_sys_path=[])
+            self._jedi_environment = jedi.create_environment(sys.executable, safe=False)
+        # parso keeps the last parse of each path and diff-parses the next version
+        # against it, so edits to a named buffer only reparse the changed region
+        return jedi.Script(code, path=file_name, project=self._jedi_project,
+                           environment=self._jedi_environment)
+
+    def cache_stats(self) -> Dict:
+        """Return statistics for the parse caches"""
+        stats = {'ast_cache': self._ast_cache.stats()}
+        if self._jedi_script is not None:
+            info = self._jedi_script.cache_info()
+            stats['jedi_script_cache'] = {
+                'hits': info.hits,
+                'misses': info.misses,
+                'size': info.currsize,
+                'maxsize': info.maxsize
+            }
+        return stats
 
-    def detect_python_version(self, code: str) -> Tuple[int, int]:
-        """Detect target Python version from code"""
+    def warm_up(self, skip: Tuple[str, ...] = ()) -> None:
+        """
+        Run every backend once so lazy imports, plugin loading and caches
+        (mypy, pylint, jedi, black, ...) are paid at startup instead of by
+        the first request of each kind
+        
+        Args:
+            skip: Names of analyzer methods to leave cold (e.g. ones run in other processes)
+        """
+        code = self.WARM_UP_CODE
+        for method in self.WARM_UP_METHODS:
+            if method in skip:
+                continue
+            if method == 'get_completions':
+                self.get_completions(code, 3, 14)
+            else:
+                getattr(self, method)(code)
+
+    def detect_python_version(self, code: str,
+                              features: Optional[FrozenSet[str]] = None) -> Tuple[int, int]:
+        """Detect target Python version from code (features: its precomputed syntax features)"""
 
         # Check for shebang or comments
-        lines = code.split('\n')[:10]
+        lines = code.split('\n', 10)[:10]  # stop splitting after the lines we read
         for line in lines:
             # #!/usr/bin/env python3.10
             if line.startswith('#!') and 'python' in line:
-                match = re.search(r'python(\d+)\.?(\d+)?', line)
+                match = _RE_SHEBANG_PY.search(line)
                 if match:
                     major = int(match.group(1))
                     minor = int(match.group(2)) if match.group(2) else 0
@@ -97,61 +410,50 @@ class PythonAnalyzer:
 
             # # requires: python>=3.8
             if 'requires' in line.lower() and 'python' in line.lower():
-                match = re.search(r'python[>=<]+(\d+)\.(\d+)', line, re.IGNORECASE)
+                match = _RE_REQUIRES_PY.search(line)
                 if match:
                     return (int(match.group(1)), int(match.group(2)))
 
         # Detect from syntax features
-        version = self._detect_from_syntax(code)
+        if features is None:
+            features = self._syntax_features(code)
+        version = self._detect_from_syntax(features)
         if version:
             return version
 
         # Default to current runtime
         return self.current_version
 
-    def _detect_from_syntax(self, code: str) -> Optional[Tuple[int, int]]:
-        """Detect minimum Python version from syntax features"""
-
-        # Python 3.10+ features
-        if re.search(r'\bmatch\s+\w+:', code):
-            return (3, 10)
-        if ' | ' in code and 'Union' not in code:  # Union type syntax
-            return (3, 10)
-
-        # Python 3.8+ features
-        if ':=' in code:  # Walrus operator
-            return (3, 8)
-
-        # Python 3.6+ features
-        if re.search(r'f["\']', code):  # f-strings
-            return (3, 6)
-
-        # Python 3.5+ features
-        if 'async def' in code or 'await ' in code:
-            return (3, 5)
-
-        # Python 3.0+
-        if 'print(' in code:
-            return (3, 0)
-
-        # Python 2 indicators
-        if re.search(r'\bprint\s+[^(]', code):
-            return (2, 7)
+    def _syntax_features(self, code: str) -> FrozenSet[str]:
+        """Return the version-relevant syntax features of the code"""
+        try:
+            tree = self._ast_cache.get(code)
+        except SyntaxError:
+            return _token_features(code)
+        return _tree_features(tree)
 
+    def _detect_from_syntax(self, features: FrozenSet[str]) -> Optional[Tuple[int, int]]:
+        """Detect minimum Python version from syntax features"""
+        for feature, version in _FEATURE_VERSIONS:
+            if feature in features:
+                return version
         return None
 
     def analyze_code(self, code: str, file_name: str = "temp.py",
                      target_version: Optional[Tuple[int, int]] = None) -> Dict:
         """Analyze Python code for errors and issues"""
 
+        # Syntax features are found once and shared by detection and compatibility checks
+        features: Optional[FrozenSet[str]] = None
         if target_version is None:
-            target_version = self.detect_python_version(code)
+            features = self._syntax_features(code)
+            target_version = self.detect_python_version(code, features)
 
         diagnostics: List[DiagnosticInfo] = []
 
         # Syntax check with ast
         try:
-            tree = ast.parse(code, filename=file_name)
+            tree = self._ast_cache.get(code, file_name)
         except SyntaxError as e:
             diagnostics.append(DiagnosticInfo(
                 message=str(e.msg),
@@ -160,7 +462,7 @@ class PythonAnalyzer:
                 file=file_name,
                 line=e.lineno or 0,
                 column=e.offset or 0,
-                severity="error"
+                severity=Severity.ERROR
             ))
             return {
                 'success': False,
@@ -170,18 +472,25 @@ class PythonAnalyzer:
                 'warning_count': 0
             }
 
-        # Feature compatibility check
-        feature_warnings = self._check_feature_compatibility(code, target_version)
-        diagnostics.extend(feature_warnings)
+        # Feature compatibility check (every checked feature exists from 3.10 on)
+        if target_version < (3, 10):
+            if features is None:
+                features = _tree_features(tree)
+            feature_warnings = self._check_feature_compatibility(features, target_version)
+            diagnostics.extend(feature_warnings)
 
         # Static analysis with pyflakes
         if HAS_PYFLAKES:
-            pyflakes_diagnostics = self._run_pyflakes(code, file_name)
+            pyflakes_diagnostics = self._run_pyflakes(tree, file_name)
             diagnostics.extend(pyflakes_diagnostics)
 
-        # Count by severity
-        error_count = sum(1 for d in diagnostics if d.severity == 'error')
-        warning_count = sum(1 for d in diagnostics if d.severity == 'warning')
+        # Count by severity in one pass
+        error_count = warning_count = 0
+        for d in diagnostics:
+            if d.severity is Severity.ERROR:
+                error_count += 1
+            elif d.severity is Severity.WARNING:
+                warning_count += 1
 
         return {
             'success': error_count == 0,
@@ -191,75 +500,69 @@ class PythonAnalyzer:
             'warning_count': warning_count
         }
 
-    def _check_feature_compatibility(self, code: str,
+    def _check_feature_compatibility(self, features: FrozenSet[str],
                                      target_version: Tuple[int, int]) -> List[DiagnosticInfo]:
         """Check if code uses features not available in target version"""
         warnings = []
 
         # Check for match/case (3.10+)
-        if target_version < (3, 10) and re.search(r'\bmatch\s+\w+:', code):
+        if target_version < (3, 10) and 'match' in features:
             warnings.append(DiagnosticInfo(
                 message=f'match/case requires Python 3.10+, target is {target_version[0]}.{target_version[1]}',
                 category="CompatibilityWarning",
                 code="W9010",
-                severity="warning"
+                severity=Severity.WARNING
             ))
 
         # Check for walrus operator (3.8+)
-        if target_version < (3, 8) and ':=' in code:
+        if target_version < (3, 8) and 'walrus' in features:
             warnings.append(DiagnosticInfo(
                 message=f'Walrus operator (:=) requires Python 3.8+, target is {target_version[0]}.{target_version[1]}',
                 category="CompatibilityWarning",
                 code="W9008",
-                severity="warning"
+                severity=Severity.WARNING
             ))
 
         # Check for f-strings (3.6+)
-        if target_version < (3, 6) and re.search(r'f["\']', code):
+        if target_version < (3, 6) and 'fstring' in features:
             warnings.append(DiagnosticInfo(
                 message=f'f-strings require Python 3.6+, target is {target_version[0]}.{target_version[1]}',
                 category="CompatibilityWarning",
                 code="W9006",
-                severity="warning"
+                severity=Severity.WARNING
             ))
 
         return warnings
 
-    def _run_pyflakes(self, code: str, file_name: str) -> List[DiagnosticInfo]:
-        """Run pyflakes static analysis"""
+    def _run_pyflakes(self, tree: ast.Module, file_name: str) -> List[DiagnosticInfo]:
+        """Run pyflakes static analysis on an already parsed module"""
         diagnostics = []
 
         try:
-            # Capture pyflakes output
-            warning_stream = StringIO()
-            reporter = pyflakes.reporter.Reporter(warning_stream, warning_stream)
-            pyflakes.api.check(code, file_name, reporter=reporter)
-
-            # Parse pyflakes output
-            output = warning_stream.getvalue()
-            for line in output.strip().split('\n'):
-                if not line:
-                    continue
-
-                # Parse format: "filename:line:col: message"
-                match = re.match(r'^(.+?):(\d+):(\d+): (.+)$', line)
-                if match:
-                    _, line_no, col_no, message = match.groups()
-
-                    # Determine severity
-                    severity = 'warning'
-                    if 'undefined name' in message.lower() or 'imported but unused' in message.lower():
-                        severity = 'error' if 'undefined' in message.lower() else 'warning'
-
-                    diagnostics.append(DiagnosticInfo(
-                        message=message,
-                        category="PyflakesWarning",
-                        code="F0001",
-                        file=file_name,
-                        line=int(line_no),
-                        column=int(col_no),
-                        severity=severity
-                    ))
+            import pyflakes.checker
+            from pyflakes import messages as pyflakes_messages
+
+            # Check the cached tree instead of letting pyflakes parse the source
+            # again (pyflakes only adds private bookkeeping attributes to nodes)
+            checker = pyflakes.checker.Checker(tree, filename=file_name)
+            checker.messages.sort(key=lambda m: m.lineno)
+            # Undefined names (including in __all__), and star imports that hide
+            # them, are errors; the rest are warnings
+            error_types = (pyflakes_messages.UndefinedName, pyflakes_messages.UndefinedExport,
+                           pyflakes_messages.ImportStarUsed)
+
+            for msg in checker.messages:
+                severity = Severity.ERROR if isinstance(msg, error_types) else Severity.WARNING
+
+                diagnostics.append(DiagnosticInfo(
+                    message=msg.message % msg.message_args,
+                    category="PyflakesWarning",
+                    code="F0001",
+                    file=file_name,
+                    line=msg.lineno,
+                    column=msg.col + 1,
+                    severity=severity
+                ))
         except Exception:
             pass  # Silently fail if pyflakes has issues
 
@@ -270,7 +573,7 @@ class PythonAnalyzer:
         """Extract all symbols from Python code"""
 
         try:
-            tree = ast.parse(code, filename=file_name)
+            tree = self._ast_cache.get(code, file_name)
         except SyntaxError:
             return {
                 'success': False,
@@ -281,10 +584,13 @@ class PythonAnalyzer:
 
         symbols: List[SymbolInfo] = []
 
-        for node in ast.walk(tree):
-            symbol = self._extract_symbol(node, code)
-            if symbol and (filter_kind is None or filter_kind == 'all' or symbol.kind == filter_kind):
-                symbols.append(symbol)
+        # Compare kinds as ints; an unknown filter name matches nothing
+        wanted = None if filter_kind is None or filter_kind == 'all' else SymbolKind.from_label(filter_kind)
+        if filter_kind is None or filter_kind == 'all' or wanted is not None:
+            for node in _SymbolCollector().collect(tree):
+                symbol = self._extract_symbol(node, code)
+                if symbol and (wanted is None or symbol.kind == wanted):
+                    symbols.append(symbol)
 
         return {
             'success': True,
@@ -292,28 +598,26 @@ class PythonAnalyzer:
             'count': len(symbols)
         }
 
-    def _extract_symbol(self, node: ast.AST, code: str) -> Optional[SymbolInfo]:
+    def _extract_symbol(self, node: _SymbolNode, code: str) -> Optional[SymbolInfo]:
         """Extract symbol information from AST node"""
 
         if isinstance(node, ast.ClassDef):
-            decorators = [ast.unparse(d) for d in node.decorator_list] if hasattr(ast, 'unparse') else []
+            decorators = tuple(_fast_unparse(d) for d in node.decorator_list)
             return SymbolInfo(
                 name=node.name,
-                kind='class',
+                kind=SymbolKind.CLASS,
                 line=node.lineno,
                 column=node.col_offset,
                 decorators=decorators if decorators else None
             )
 
-        elif isinstance(node, ast.FunctionDef) or isinstance(node, ast.AsyncFunctionDef):
-            decorators = [ast.unparse(d) for d in node.decorator_list] if hasattr(ast, 'unparse') else []
-            type_annotation = None
-            if node.returns:
-                type_annotation = ast.unparse(node.returns) if hasattr(ast, 'unparse') else None
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            decorators = tuple(_fast_unparse(d) for d in node.decorator_list)
+            type_annotation = _fast_unparse(node.returns) if node.returns else None
 
             return SymbolInfo(
                 name=node.name,
-                kind='function',
+                kind=SymbolKind.FUNCTION,
                 line=node.lineno,
                 column=node.col_offset,
                 type_annotation=type_annotation,
@@ -321,13 +625,13 @@ class PythonAnalyzer:
                 decorators=decorators if decorators else None
             )
 
-        elif isinstance(node, (ast.AnnAssign, ast.Assign)):
+        elif isinstance(node, ast.AnnAssign):
             # Variable assignments
-            if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
-                type_annotation = ast.unparse(node.annotation) if hasattr(ast, 'unparse') else None
+            if type(node.target) is ast.Name:
+                type_annotation = _fast_unparse(node.annotation)
                 return SymbolInfo(
                     name=node.target.id,
-                    kind='variable',
+                    kind=SymbolKind.VARIABLE,
                     line=node.lineno,
                     column=node.col_offset,
                     type_annotation=type_annotation
@@ -346,7 +650,9 @@ class PythonAnalyzer:
             }
 
         try:
-            formatted = black.format_str(code, mode=BlackMode())
+            import black
+
+            formatted = black.format_str(code, mode=black.Mode())
             return {
                 'success': True,
                 'formatted_code': formatted
@@ -359,44 +665,39 @@ class PythonAnalyzer:
             }
 
     def calculate_metrics(self, code: str, file_name: str = "temp.py") -> Dict:
-        """Calculate code metrics"""
-
-        if not HAS_RADON:
-            return {
-                'success': False,
-                'error': 'radon is not installed'
-            }
+        """Calculate code metrics (the maintainability index needs radon; None without it)"""
 
         try:
             # Parse for structure
-            tree = ast.parse(code, filename=file_name)
+            tree = self._ast_cache.get(code, file_name)
 
-            # Count classes and functions
-            class_count = sum(1 for node in ast.walk(tree) if isinstance(node, ast.ClassDef))
-            function_count = sum(1 for node in ast.walk(tree)
-                                 if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)))
+            # Count classes and functions and calculate complexity in one walk
+            visitor = MetricsVisitor()
+            visitor.visit(tree)
 
-            # Calculate complexity
-            complexity_results = cc_visit(code)
-            total_complexity = sum(item.complexity for item in complexity_results)
-            avg_complexity = total_complexity / len(complexity_results) if complexity_results else 0.0
+            # Analyze raw metrics (radon's counts, in one tokenizer pass)
+            raw_metrics = analyze_raw(code)
 
-            # Calculate maintainability index
-            mi = mi_visit(code, multi=True)
+            # Calculate maintainability index from the same tree and raw counts
+            # (radon's mi_visit would parse and analyze the code all over again);
+            # multi-line strings count as comments, as with mi_visit(multi=True).
+            # Only the Halstead volume it needs still comes from radon
+            mi = None
+            if HAS_RADON:
+                from radon.metrics import h_visit_ast, mi_compute
 
-            # Analyze raw metrics
-            raw_metrics = analyze(code)
+                comment_lines = raw_metrics.comments + raw_metrics.multi
+                comments_percent = comment_lines / raw_metrics.sloc * 100 if raw_metrics.sloc else 0
+                mi = mi_compute(h_visit_ast(tree).total.volume, visitor.total_complexity,
+                                raw_metrics.lloc, comments_percent)
 
             metrics = CodeMetrics(
                 lines_of_code=raw_metrics.loc,
                 comment_lines=raw_metrics.comments,
                 blank_lines=raw_metrics.blank,
                 total_lines=raw_metrics.loc + raw_metrics.comments + raw_metrics.blank,
-                cyclomatic_complexity=total_complexity,
                 maintainability_index=mi,
-                function_count=function_count,
-                class_count=class_count,
-                average_complexity=avg_complexity
+                **visitor.result()
             )
 
             return {
@@ -409,6 +710,86 @@ class PythonAnalyzer:
                 'error': str(e)
             }
 
+    def _start_dmypy(self) -> Optional[Tuple[str, str]]:
+        """
+        Start (or restart) this analyzer's mypy daemon
+
+        Returns:
+            The daemon's (status file, checked source file), or None if it cannot run
+        """
+        from mypy import api as mypy_api
+
+        base = os.path.join(analysis_temp_dir(), f'dmypy_{os.getpid()}_{id(self)}')
+        status, source = base + '.json', base + '.py'
+        if os.path.exists(status):
+            # The previous daemon stopped answering; make sure it is gone
+            mypy_api.run_dmypy(['--status-file', status, 'kill'])
+            if os.path.exists(status):
+                os.unlink(status)
+        try:
+            # 'dmypy start' daemonizes by forking, so it is run as a separate process
+            result = subprocess.run(
+                [sys.executable, '-m', 'mypy.dmypy', '--status-file', status, 'start',
+                 '--timeout', str(DMYPY_IDLE_TIMEOUT), '--', *MYPY_FLAGS],
+                capture_output=True, text=True, timeout=120)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if result.returncode != 0:
+            return None
+
+        if self._dmypy_files is None:
+            atexit.register(self._stop_dmypy)
+        self._dmypy_files = status, source
+        return self._dmypy_files
+
+    def _stop_dmypy(self) -> None:
+        """Stop this analyzer's mypy daemon if it is running"""
+        if self._dmypy_files is not None:
+            from mypy import api as mypy_api
+            status, source = self._dmypy_files
+            mypy_api.run_dmypy(['--status-file', status, 'stop'])
+            if os.path.exists(source):
+                os.unlink(source)
+
+    def _run_dmypy(self, code: str) -> Optional[Tuple[str, int]]:
+        """
+        Type check the code with the mypy daemon (call under _MYPY_LOCK)
+        
+        Args:
+            code: Python code to type check
+        
+        Returns:
+            mypy's (stdout, exit code), or None if the daemon is unavailable
+        """
+        from mypy import api as mypy_api
+
+        if self._dmypy_unavailable:
+            return None
+        files = self._dmypy_files or self._start_dmypy()
+        if files is None:
+            self._dmypy_unavailable = True
+            return None
+        status, source = files
+
+        # Every check rewrites the same file: the daemon drops blocking errors
+        # (syntax errors and the like) of files added after a clean check
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write(code)
+        # The daemon compares whole-second mtimes before hashing, so step the
+        # mtime forward on each write or a same-size edit would go unnoticed
+        self._dmypy_mtime = max(self._dmypy_mtime + 1, int(time.time()))
+        os.utime(source, (self._dmypy_mtime, self._dmypy_mtime))
+
+        for attempt in range(2):
+            stdout, _, exit_code = mypy_api.run_dmypy(['--status-file', status, 'check', source])
+            # Diagnostics always go to stdout; exit code 2 without any means
+            # the daemon itself failed (e.g. it shut down after idling)
+            if exit_code != 2 or stdout:
+                return stdout, exit_code
+            if attempt == 0 and self._start_dmypy() is None:
+                break
+        return None
+
     def type_check(self, code: str, file_name: str = "temp.py") -> Dict:
         """
         Run static type checking using mypy
@@ -427,59 +808,18 @@ class PythonAnalyzer:
             }
 
         try:
-            # Write code to temp file (mypy needs files)
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_path = f.name
+            from mypy import api as mypy_api
 
-            try:
-                # Run mypy
-                result = mypy_api.run([temp_path, '--show-column-numbers', '--no-error-summary'])
-                stdout, stderr, exit_code = result
-
-                diagnostics = []
-
-                # Parse mypy output
-                for line in stdout.strip().split('\n'):
-                    if not line or ':' not in line:
-                        continue
-
-                    # Parse format: "file:line:col: severity: message"
-                    parts = line.split(':', 4)
-                    if len(parts) >= 4:
-                        try:
-                            line_no = int(parts[1])
-                            col_no = int(parts[2]) if parts[2].strip().isdigit() else 0
-                            message = parts[3].strip() if len(parts) > 3 else line
-
-                            # Determine severity
-                            severity = 'error' if 'error' in message.lower() else 'warning'
-
-                            diagnostics.append({
-                                'message': message,
-                                'category': 'TypeCheck',
-                                'code': 'MYPY',
-                                'file': file_name,
-                                'line': line_no,
-                                'column': col_no,
-                                'severity': severity
-                            })
-                        except (ValueError, IndexError):
-                            continue
-
-                error_count = sum(1 for d in diagnostics if d['severity'] == 'error')
-                warning_count = sum(1 for d in diagnostics if d['severity'] == 'warning')
-
-                return {
-                    'success': exit_code == 0,
-                    'diagnostics': diagnostics,
-                    'error_count': error_count,
-                    'warning_count': warning_count
-                }
-            finally:
-                # Cleanup temp file
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
+            with _MYPY_LOCK:
+                result = self._run_dmypy(code)
+                if result is None:
+                    # No daemon: feed the source to mypy in-process as a program string
+                    stdout, _, exit_code = mypy_api.run(['-c', code, *MYPY_FLAGS])
+                else:
+                    stdout, exit_code = result
+
+            # Parse mypy output in one scan, without splitting it into lines first
+            return self._mypy_result(_RE_MYPY_LINE.findall(stdout), exit_code == 0, file_name)
 
         except Exception as e:
             return {
@@ -487,6 +827,89 @@ class PythonAnalyzer:
                 'error': str(e)
             }
 
+    @staticmethod
+    def _mypy_result(rows: List[Tuple[str, ...]], success: bool, file_name: str) -> Dict:
+        """Build a type check result from mypy's (line, column, severity, message) rows"""
+        diagnostics = []
+        error_count = 0
+        for line_no, col_no, severity, message in rows:
+            is_error = severity == 'error'
+            error_count += is_error
+
+            diagnostics.append({
+                'message': message.strip(),
+                'category': 'TypeCheck',
+                'code': 'MYPY',
+                'file': file_name,
+                'line': int(line_no),
+                'column': int(col_no),
+                # mypy reports "error" or "note"
+                'severity': 'error' if is_error else 'warning'
+            })
+
+        return {
+            'success': success,
+            'diagnostics': diagnostics,
+            'error_count': error_count,
+            'warning_count': len(diagnostics) - error_count
+        }
+
+    def type_check_many(self, files: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        Type check several files with a single mypy run
+        
+        Each file is checked as a module of its own, as type_check would check
+        it, but typeshed and the builtins are loaded once for all of them.
+        
+        Args:
+            files: (file_name, code) pairs
+        
+        Returns:
+            type_check's result for each file, in order
+        """
+        if not HAS_MYPY:
+            return [{'success': False, 'error': 'mypy is not installed'} for _ in files]
+
+        # Result of each file by index, filled in as its check completes
+        results: Dict[int, Dict] = {}
+        # A syntax error stops mypy for every file of a run, so files that do
+        # not parse are checked on their own
+        batch = []
+        for i, (file_name, code) in enumerate(files):
+            try:
+                self._ast_cache.get(code, file_name)
+                batch.append(i)
+            except SyntaxError:
+                results[i] = self.type_check(code, file_name)
+
+        try:
+            from mypy import api as mypy_api
+
+            if batch:
+                with _temp_source_dir([files[i][1] for i in batch]) as paths:
+                    with _MYPY_LOCK:
+                        stdout, _, exit_code = mypy_api.run([*paths, *MYPY_FLAGS])
+
+                if exit_code == 2:
+                    # Some other blocking error: check the files one by one
+                    for i in batch:
+                        results[i] = self.type_check(files[i][1], files[i][0])
+                else:
+                    rows: Dict[str, List[Tuple[str, ...]]] = {os.path.basename(path): [] for path in paths}
+                    for path, *row in _RE_MYPY_FILE_LINE.findall(stdout):
+                        file_rows = rows.get(os.path.basename(path))
+                        if file_rows is not None:
+                            file_rows.append(row)
+                    for i, path in zip(batch, paths):
+                        file_rows = rows[os.path.basename(path)]
+                        success = not any(row[2] == 'error' for row in file_rows)
+                        results[i] = self._mypy_result(file_rows, success, files[i][0])
+
+            return [results[i] for i in range(len(files))]
+
+        except Exception as e:
+            return [results.get(i) or {'success': False, 'error': str(e)} for i in range(len(files))]
+
     def detect_dead_code(self, code: str, file_name: str = "temp.py") -> Dict:
         """
         Detect unused functions, classes, variables using vulture
@@ -505,35 +928,27 @@ class PythonAnalyzer:
             }
 
         try:
-            # Write code to temp file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_path = f.name
-
-            try:
-                # Run vulture
-                vuln = vulture.Vulture()
-                vuln.scavenge([temp_path])
-
-                unused_items = []
-                for item in vuln.get_unused_code():
-                    unused_items.append({
-                        'name': item.name if hasattr(item, 'name') else 'unknown',
-                        'type': item.typ if hasattr(item, 'typ') else 'unknown',
-                        'line': item.first_lineno if hasattr(item, 'first_lineno') else 0,
-                        'confidence': item.confidence if hasattr(item, 'confidence') else 60,
-                        'message': f"Unused {item.typ}: {item.name}" if hasattr(item, 'typ') and hasattr(item, 'name') else str(item)
-                    })
+            import vulture
+
+            # Run vulture directly on the source string (no temp file)
+            vuln = vulture.Vulture()
+            vuln.scan(code, filename=file_name)
+
+            unused_items = []
+            for item in vuln.get_unused_code():
+                unused_items.append({
+                    'name': item.name if hasattr(item, 'name') else 'unknown',
+                    'type': item.typ if hasattr(item, 'typ') else 'unknown',
+                    'line': item.first_lineno if hasattr(item, 'first_lineno') else 0,
+                    'confidence': item.confidence if hasattr(item, 'confidence') else 60,
+                    'message': f"Unused {item.typ}: {item.name}" if hasattr(item, 'typ') and hasattr(item, 'name') else str(item)
+                })
 
-                return {
-                    'success': True,
-                    'unused_code': unused_items,
-                    'count': len(unused_items)
-                }
-            finally:
-                # Cleanup temp file
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
+            return {
+                'success': True,
+                'unused_code': unused_items,
+                'count': len(unused_items)
+            }
 
         except Exception as e:
             return {
@@ -541,6 +956,72 @@ class PythonAnalyzer:
                 'error': str(e)
             }
 
+    def _run_pylint(self, code: str, reporter: 'BaseReporter') -> None:
+        """
+        Run pylint over the code, delivering messages to the given reporter
+
+        Args:
+            code: Python code to analyze
+            reporter: pylint reporter receiving each message as it is emitted
+        """
+        with _temp_source_file(code) as temp_path:
+            self._lint_paths([temp_path], reporter)
+
+    def _lint_paths(self, paths: List[str], reporter: 'BaseReporter') -> None:
+        """
+        Run pylint over temp modules, delivering messages to the given reporter
+
+        Args:
+            paths: Python files to lint (each is forgotten by astroid afterwards)
+            reporter: pylint reporter receiving each message as it is emitted
+        """
+        from astroid import MANAGER as ASTROID_MANAGER
+        from pylint.lint import Run as PylintRun
+        from pylint.utils import LinterStats
+
+        with _PYLINT_LOCK:
+            if self._pylinter is None:
+                # Run pylint with the modern API
+                # Use exit=False to prevent system exit; --persistent=n stops
+                # pylint saving a stats file per (uniquely named) temp module
+                pylint_argv = [*paths, '--reports=no', '--score=no', '--persistent=n']
+
+                try:
+                    # pylint.lint.Run modifies sys.argv, so we need to handle this carefully
+                    self._pylinter = PylintRun(pylint_argv, reporter=reporter, exit=False).linter
+                except SystemExit:
+                    # Pylint might still try to exit despite exit=False in some versions
+                    pass
+            else:
+                # Re-check with the configured linter, as pylint's own runner does
+                linter = self._pylinter
+                linter.stats = LinterStats()
+                linter.set_reporter(reporter)
+                linter.check(paths)
+                linter.generate_reports()
+
+            # Drop the temp modules from astroid's cache (they are never seen again)
+            for path in paths:
+                module_name = os.path.splitext(os.path.basename(path))[0]
+                ASTROID_MANAGER.astroid_cache.pop(module_name, None)
+
+    @staticmethod
+    def _pylint_message_to_dict(msg: 'Message', file_name: str) -> Dict:
+        """Convert a pylint message to a diagnostic dictionary"""
+        # Determine severity from code prefix
+        # C=convention, R=refactor, W=warning, E=error, F=fatal, I=info
+        severity = 'error' if msg.msg_id[0] in ['E', 'F'] else 'warning'
+
+        return {
+            'message': msg.msg,
+            'category': 'Pylint',
+            'code': msg.msg_id,
+            'file': file_name,
+            'line': msg.line,
+            'column': msg.column,
+            'severity': severity
+        }
+
     def comprehensive_lint(self, code: str, file_name: str = "temp.py") -> Dict:
         """
         Run comprehensive linting using pylint (modern API for pylint 3.x)
@@ -559,68 +1040,15 @@ class PythonAnalyzer:
             }
 
         try:
-            # Write code to temp file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_path = f.name
-
-            try:
-                # Capture pylint output
-                output_stream = StringIO()
-                reporter = TextReporter(output_stream)
+            from pylint.reporters import CollectingReporter
 
-                # Run pylint with the modern API
-                # Use exit=False to prevent system exit
-                pylint_argv = [temp_path, '--output-format=text', '--reports=no']
-
-                try:
-                    # pylint.lint.Run modifies sys.argv, so we need to handle this carefully
-                    PylintRun(pylint_argv, reporter=reporter, exit=False)
-                except SystemExit:
-                    # Pylint might still try to exit despite exit=False in some versions
-                    pass
+            # Collect pylint messages as objects instead of formatting
+            # them to text and parsing them back
+            reporter = CollectingReporter()
+            self._run_pylint(code, reporter)
 
-                output = output_stream.getvalue()
-                diagnostics = []
-
-                # Parse pylint output format: "path/file.py:line:col: code: message (symbol-name)"
-                for line in output.split('\n'):
-                    if not line or not ':' in line:
-                        continue
-
-                    # Try to match the standard pylint output format
-                    # Format: file.py:10:0: C0116: Missing function or method docstring (missing-function-docstring)
-                    match = re.match(r'^.+?:(\d+):(\d+): ([WCEFIR]\d+): (.+?)(?:\s+\([^)]+\))?$', line.strip())
-                    if match:
-                        line_no, col_no, code, message = match.groups()
-
-                        # Determine severity from code prefix
-                        # C=convention, R=refactor, W=warning, E=error, F=fatal, I=info
-                        severity = 'error' if code[0] in ['E', 'F'] else 'warning'
-
-                        diagnostics.append({
-                            'message': message,
-                            'category': 'Pylint',
-                            'code': code,
-                            'file': file_name,
-                            'line': int(line_no),
-                            'column': int(col_no),
-                            'severity': severity
-                        })
-
-                error_count = sum(1 for d in diagnostics if d['severity'] == 'error')
-                warning_count = sum(1 for d in diagnostics if d['severity'] == 'warning')
-
-                return {
-                    'success': error_count == 0,
-                    'diagnostics': diagnostics,
-                    'error_count': error_count,
-                    'warning_count': warning_count
-                }
-            finally:
-                # Cleanup temp file
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
+            return self._lint_result(
+                [self._pylint_message_to_dict(msg, file_name) for msg in reporter.messages])
 
         except Exception as e:
             return {
@@ -628,7 +1056,130 @@ class PythonAnalyzer:
                 'error': str(e)
             }
 
-    def get_completions(self, code: str, line: int, column: int) -> Dict:
+    @staticmethod
+    def _lint_result(diagnostics: List[Dict]) -> Dict:
+        """Build a lint result from pylint diagnostics, counted in one pass"""
+        error_count = 0
+        for diagnostic in diagnostics:
+            if diagnostic['severity'] == 'error':
+                error_count += 1
+
+        return {
+            'success': error_count == 0,
+            'diagnostics': diagnostics,
+            'error_count': error_count,
+            # Every pylint message is reported as an error or a warning
+            'warning_count': len(diagnostics) - error_count
+        }
+
+    def comprehensive_lint_many(self, files: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        Lint several files with a single pylint run
+        
+        Args:
+            files: (file_name, code) pairs
+        
+        Returns:
+            comprehensive_lint's result for each file, in order
+        """
+        if not HAS_PYLINT:
+            return [{'success': False, 'error': 'pylint is not installed'} for _ in files]
+
+        try:
+            from pylint.reporters import CollectingReporter
+
+            reporter = CollectingReporter()
+            with _temp_source_dir([code for _, code in files]) as paths:
+                self._lint_paths(paths, reporter)
+
+            index = {os.path.basename(path): i for i, path in enumerate(paths)}
+            per_file: List[List[Dict]] = [[] for _ in files]
+            for msg in reporter.messages:
+                i = index.get(os.path.basename(msg.path))
+                if i is not None and msg.msg_id not in _PYLINT_CROSS_MODULE:
+                    per_file[i].append(self._pylint_message_to_dict(msg, files[i][0]))
+
+            return [self._lint_result(diagnostics) for diagnostics in per_file]
+
+        except Exception as e:
+            return [{'success': False, 'error': str(e)} for _ in files]
+
+    def iter_lint_diagnostics(self, code: str, file_name: str = "temp.py") -> Iterator[Dict]:
+        """
+        Run pylint and yield each diagnostic as soon as pylint reports it
+        
+        Args:
+            code: Python code to analyze
+            file_name: Optional filename for context
+        
+        Yields:
+            Diagnostic dictionaries, followed by a final summary dictionary
+            ('success', 'error_count', 'warning_count') or an error dictionary
+        """
+        if not HAS_PYLINT:
+            yield {
+                'success': False,
+                'error': 'pylint is not installed'
+            }
+            return
+
+        from pylint.message import Message
+        from pylint.reporters import BaseReporter
+        from pylint.reporters.ureports.nodes import Section
+
+        # pylint runs in a helper thread and hands messages over through a queue
+        messages: 'queue.Queue' = queue.Queue()
+        done = object()
+
+        class QueueReporter(BaseReporter):
+            """Hands each message over to the consumer as soon as pylint reports it"""
+            name = 'queue'
+
+            def handle_message(self, msg: Message) -> None:
+                messages.put(msg)
+
+            def _display(self, layout: Section) -> None:
+                pass
+
+        reporter = QueueReporter()
+
+        def run() -> None:
+            try:
+                self._run_pylint(code, reporter)
+                messages.put(done)
+            except Exception as e:
+                messages.put(e)
+
+        threading.Thread(target=run, name='pylint-stream', daemon=True).start()
+
+        error_count = 0
+        warning_count = 0
+        while True:
+            item = messages.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                yield {
+                    'success': False,
+                    'error': str(item)
+                }
+                return
+
+            diagnostic = self._pylint_message_to_dict(item, file_name)
+            if diagnostic['severity'] == 'error':
+                error_count += 1
+            else:
+                warning_count += 1
+            yield diagnostic
+
+        yield {
+            'success': error_count == 0,
+            'error_count': error_count,
+            'warning_count': warning_count
+        }
+
+    def get_completions(self, code: str, line: int, column: int,
+                        file_name: Optional[str] = None, limit: Optional[int] = None) -> Dict:
         """
         Get code completions at a specific position using jedi
         
@@ -636,6 +1187,8 @@ class PythonAnalyzer:
             code: Python code
             line: Line number (1-based)
             column: Column number (0-based)
+            file_name: Optional filename of the buffer (speeds up repeated edits)
+            limit: Optional maximum number of suggestions (at most 50 are returned)
         
         Returns:
             List of completion suggestions
@@ -647,17 +1200,23 @@ class PythonAnalyzer:
             }
 
         try:
-            script = jedi.Script(code)
-            completions = script.complete(line, column)
-
-            suggestions = []
-            for comp in completions[:50]:  # Limit to 50 suggestions
-                suggestions.append({
-                    'name': comp.name,
-                    'type': comp.type,
-                    'description': comp.description if hasattr(comp, 'description') else None,
-                    'signature': str(comp.get_signatures()[0]) if comp.get_signatures() else None
-                })
+            assert self._jedi_script is not None  # created whenever jedi is installed
+            with _JEDI_LOCK:
+                script = self._jedi_script(code, file_name)
+                completions = script.complete(line, column)
+
+                # Limit to 50 suggestions; those past the limit are never inferred
+                count = 50 if limit is None else max(0, min(limit, 50))
+                suggestions = []
+                for comp in completions[:count]:
+                    # Both are inferred on every access (hasattr() included), so read each once
+                    signatures = comp.get_signatures()
+                    suggestions.append({
+                        'name': comp.name,
+                        'type': comp.type,
+                        'description': getattr(comp, 'description', None),
+                        'signature': str(signatures[0]) if signatures else None
+                    })
 
             return {
                 'success': True,
@@ -690,7 +1249,11 @@ class PythonAnalyzer:
             }
 
         try:
-            formatted = autopep8.fix_code(code, options={'max_line_length': max_line_length})
+            import autopep8
+
+            # fix_code rebinds and extends option lists, so each call gets its own copy
+            options = copy.copy(_autopep8_options(max_line_length))
+            formatted = autopep8.fix_code(code, options=options)
             return {
                 'success': True,
                 'formatted_code': formatted
@@ -711,14 +1274,14 @@ class PythonAnalyzer:
             'file': diagnostic.file,
             'line': diagnostic.line,
             'column': diagnostic.column,
-            'severity': diagnostic.severity
+            'severity': diagnostic.severity.label
         }
 
     def _symbol_to_dict(self, symbol: SymbolInfo) -> Dict:
         """Convert SymbolInfo to dictionary"""
         return {
             'name': symbol.name,
-            'kind': symbol.kind,
+            'kind': symbol.kind.label,
             'line': symbol.line,
             'column': symbol.column,
             'type_annotation': symbol.type_annotation,
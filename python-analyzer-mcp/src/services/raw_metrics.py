@@ -0,0 +1,184 @@
+"""Single-pass raw line metrics (LOC, LLOC, SLOC, comments, blanks)"""
+import io
+import re
+import tokenize
+from typing import Iterator, List, NamedTuple, Tuple
+
+# Tokens that carry no content of their own
+_LAYOUT_TOKENS = (tokenize.NL, tokenize.NEWLINE, tokenize.ENDMARKER)
+# Tokens _logical_lines drops before looking for a block-opening colon
+_LINE_END_TOKENS = (tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE)
+_COLON = (tokenize.OP, ':')
+_SEMICOLON = (tokenize.OP, ';')
+# Line breaks that str.splitlines() honours but the tokenizer does not
+_RE_OTHER_LINE_BREAK = re.compile('\r(?!\n)|[\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+class RawMetrics(NamedTuple):
+    """Raw line counts, field for field as radon.raw.analyze reports them"""
+    loc: int
+    lloc: int
+    sloc: int
+    comments: int
+    multi: int
+    blank: int
+    single_comments: int
+
+
+def _logical_lines(tokens: List[Tuple[int, str]]) -> int:
+    """Count logical lines in one chunk's (type, string) tokens, by radon's rules"""
+    count = 0
+    subs: List[List[Tuple[int, str]]] = [[]]
+    for token in tokens:
+        if token == _SEMICOLON:
+            subs.append([])
+        else:
+            subs[-1].append(token)
+    # radon tokenizes each chunk on its own, so its last statement ends with ENDMARKER
+    subs[-1].append((tokenize.ENDMARKER, ''))
+
+    for sub in subs:
+        processed = [t for t in sub if t[0] not in _LINE_END_TOKENS]
+        colon = next((i for i in range(len(processed) - 1, -1, -1)
+                      if processed[i] == _COLON), None)
+        if colon is not None:
+            # A trailing colon opens a block (one line); anything after it is a second
+            count += 2 - (colon == len(processed) - 2)
+        elif any(t[0] not in _LAYOUT_TOKENS for t in processed):
+            count += 1
+    return count
+
+
+def _tokenize_lines(first: str, lines: Iterator[str]) -> Tuple[List[tokenize.TokenInfo], List[str]]:
+    """Tokenize from first, adding lines until they tokenize cleanly (StopIteration if they never do)"""
+    buffer = first
+    used = [first]
+    while True:
+        try:
+            tokens = list(tokenize.generate_tokens(io.StringIO(buffer).readline))
+        except tokenize.TokenError:
+            pass  # an unfinished string or bracket
+        else:
+            if not any(t.type == tokenize.ERRORTOKEN for t in tokens):
+                return tokens, used
+        next_line = next(lines)
+        buffer = buffer + '\n' + next_line
+        used.append(next_line)
+
+
+def _analyze_by_lines(code: str) -> RawMetrics:
+    """Compute raw line metrics as radon.raw.analyze does: line by line, over str.splitlines()"""
+    lloc = comments = single_comments = multi = blank = sloc = 0
+    lines = (line.strip() for line in code.splitlines())
+    lineno = 1
+    for line in lines:
+        try:
+            tokens, used = _tokenize_lines(line, lines)
+        except StopIteration:
+            raise SyntaxError(f'SyntaxError at line: {lineno}') from None
+        lineno += len(used)
+        comments += sum(1 for t in tokens if t.type == tokenize.COMMENT)
+
+        filled = sum(1 for used_line in used if used_line)
+        only_token = all(t.type in _LAYOUT_TOKENS for t in tokens[1:])
+        if tokens[0].type == tokenize.COMMENT and only_token:
+            single_comments += 1
+        elif tokens[0].type == tokenize.STRING and only_token:
+            # A statement that is only a string: a docstring
+            if tokens[0].start[0] == tokens[0].end[0]:
+                single_comments += 1
+            else:
+                multi += filled
+                blank += len(used) - filled
+        else:
+            sloc += filled
+            blank += len(used) - filled
+        # _logical_lines adds the ENDMARKER itself
+        lloc += _logical_lines([(t.type, t.string) for t in tokens if t.type != tokenize.ENDMARKER])
+
+    loc = sloc + blank + multi + single_comments
+    return RawMetrics(loc, lloc, sloc, comments, multi, blank, single_comments)
+
+
+def analyze_raw(code: str) -> RawMetrics:
+    """
+    Compute raw line metrics with one tokenizer pass
+
+    Gives the same counts as radon.raw.analyze, which tokenizes line by line
+    and re-tokenizes a growing buffer for every multi-line statement.
+
+    Args:
+        code: Python source that parses
+
+    Returns:
+        The raw line counts
+    """
+    if _RE_OTHER_LINE_BREAK.search(code):
+        # Lines split differently from the tokenizer's; count them radon's way
+        return _analyze_by_lines(code)
+
+    lines = code.splitlines()
+    lloc = comments = single_comments = multi = blank = sloc = 0
+
+    # A chunk is what radon tokenizes at once: a whole logical line, or a
+    # single blank or comment-only line
+    chunk: List[Tuple[int, str]] = []
+    chunk_start = 1       # first physical line of the chunk
+    has_code = False      # the chunk holds more than comments and line breaks
+    first_string = None   # the chunk's leading STRING token, while it is its only content
+
+    # Token types as locals: this loop runs once per token
+    COMMENT, NL, NEWLINE, STRING = tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.STRING
+    skipped = (tokenize.INDENT, tokenize.DEDENT, tokenize.ENDMARKER)
+
+    for tok in tokenize.generate_tokens(io.StringIO(code).readline):
+        tok_type = tok.type
+        if tok_type in skipped:
+            continue
+        if tok_type == COMMENT:
+            comments += 1
+        elif tok_type == STRING and not chunk:
+            first_string = tok
+        elif tok_type != NL and tok_type != NEWLINE:
+            first_string = None
+        if tok_type not in _LAYOUT_TOKENS and tok_type != COMMENT:
+            has_code = True
+        chunk.append((tok_type, tok.string))
+
+        # Line breaks inside an unfinished statement do not end the chunk
+        if tok_type != NEWLINE and (tok_type != NL or has_code):
+            continue
+
+        chunk_end = tok.end[0]
+        chunk_lines = lines[chunk_start - 1:chunk_end]
+        filled = sum(1 for line in chunk_lines if line.strip())
+        empty = len(chunk_lines) - filled
+
+        if chunk[0][0] == COMMENT and all(t[0] in _LAYOUT_TOKENS for t in chunk[1:]):
+            single_comments += 1
+        elif first_string is not None and all(t[0] in _LAYOUT_TOKENS for t in chunk[1:]):
+            # A statement that is only a string: a docstring
+            if first_string.start[0] == first_string.end[0]:
+                single_comments += 1
+            else:
+                multi += filled
+                blank += empty
+        else:
+            sloc += filled
+            blank += empty
+        if _SEMICOLON in chunk:
+            lloc += _logical_lines(chunk)
+        elif _COLON in chunk:
+            # As in _logical_lines: one line if the last colon ends the statement, else two
+            last = next(t for t in reversed(chunk) if t[0] not in _LINE_END_TOKENS)
+            lloc += 1 if last == _COLON else 2
+        elif has_code:
+            lloc += 1
+
+        chunk = []
+        chunk_start = chunk_end + 1
+        has_code = False
+        first_string = None
+
+    loc = sloc + blank + multi + single_comments
+    return RawMetrics(loc, lloc, sloc, comments, multi, blank, single_comments)
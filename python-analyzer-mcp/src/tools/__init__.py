@@ -1,4 +1,4 @@
 """Tools package for Python analyzer"""
-from .python_tools import PythonTools
+from .python_tools import ANALYZE_ALL_TOOLS, PythonTools
 
-__all__ = ['PythonTools']
+__all__ = ['ANALYZE_ALL_TOOLS', 'PythonTools']
@@ -1,16 +1,176 @@
 """MCP tool handlers for Python analysis"""
-from typing import Dict, Any, Optional
+import functools
+import multiprocessing
+import os
+import threading
+from multiprocessing.util import Finalize
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+from ..cache import ResultCache
 from ..services import PythonAnalyzer
 
+# Analyzers that analyze_all runs by default, in result order
+ANALYZE_ALL_TOOLS = (
+    'analyze_code',
+    'get_symbols',
+    'calculate_metrics',
+    'type_check',
+    'detect_dead_code',
+    'comprehensive_lint',
+)
+
+# Analyzer methods that run in the worker pool when there is one
+POOLED_METHODS = ('type_check', 'detect_dead_code', 'comprehensive_lint')
+# Backends pool workers leave cold, since they only ever run POOLED_METHODS
+_UNPOOLED_METHODS = tuple(m for m in PythonAnalyzer.WARM_UP_METHODS if m not in POOLED_METHODS)
+
+# Pool size when none is given; each worker runs its own mypy daemon and keeps
+# pylint's and mypy's state in memory, so a worker per core is opt-in
+DEFAULT_WORKERS = 2
+
+# Set to 0 to leave the analysis backends cold until their first request
+WARM_UP_ENV = 'PYTHON_ANALYZER_WARM'
+
+# Pool workers are started on demand, possibly while other threads hold locks
+# (jedi, black, the analyzer caches); forking then could copy a held lock into
+# the worker, so where available they come from a single-threaded fork server
+_POOL_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else None)
+
+@functools.lru_cache(maxsize=32)
+def _parse_version(python_version: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse a target version such as "3.8" (None for "auto" or anything unparsable)"""
+    if not python_version or python_version == "auto":
+        return None
+    try:
+        parts = python_version.split('.')
+        return (int(parts[0]), int(parts[1]) if len(parts) > 1 else 0)
+    except (ValueError, IndexError):
+        return None
+
+
+# Analyzer owned by each pool worker process
+_worker_analyzer: Optional[PythonAnalyzer] = None
+# Barrier shared by the pool's workers, which _worker_ready tasks wait at
+_worker_barrier: Any = None
+
+# Longest a warm-up task waits for the other workers to start and warm up (seconds)
+_WORKER_READY_TIMEOUT = 120
+
+
+def _init_worker(warm_up: bool, barrier: Any) -> None:
+    """Create (and optionally warm up) the analyzer of a pool worker process"""
+    global _worker_analyzer, _worker_barrier
+    _worker_analyzer = PythonAnalyzer()
+    _worker_barrier = barrier
+    # Pool workers skip atexit handlers, so stop the worker's mypy daemon this way
+    Finalize(_worker_analyzer, _worker_analyzer._stop_dmypy, exitpriority=10)
+    if warm_up:
+        _worker_analyzer.warm_up(skip=_UNPOOLED_METHODS)
+
+
+def _worker_ready() -> None:
+    """Hold this worker until every worker of the pool is running one of these tasks"""
+    try:
+        _worker_barrier.wait(timeout=_WORKER_READY_TIMEOUT)
+    except threading.BrokenBarrierError:
+        pass  # a worker failed to start in time; the others are ready anyway
+
+
+def _run_in_worker(method: str, *args: Any) -> Any:
+    """Invoke an analyzer method inside a pool worker process, returning its result"""
+    return getattr(_worker_analyzer, method)(*args)
+
 
 class PythonTools:
     """MCP tools for Python code analysis"""
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 1024, warm_up: Optional[bool] = None,
+                 workers: Optional[int] = None):
+        if warm_up is None:
+            warm_up = os.environ.get(WARM_UP_ENV, '1') != '0'
         self.analyzer = PythonAnalyzer()
+        # Identical requests (editor/CI retries) are served from here
+        self._cache = ResultCache(maxsize=cache_size)
+
+        # mypy, pylint and vulture are CPU-bound and hold the GIL, so they run
+        # in a process pool (DEFAULT_WORKERS, at most one per core, by default;
+        # 0 runs them in-process)
+        self._workers = min(DEFAULT_WORKERS, os.cpu_count() or 1) if workers is None else workers
+        self._warm_up = warm_up
+        self._pool_lock = threading.Lock()
+        self._pool = self._create_pool() if self._workers > 0 else None
+        # Threads that fan analyze_all out to the individual tools (created on first use)
+        self._fanout: Optional[ThreadPoolExecutor] = None
+
+        # Pay backend cold-start costs (imports, the mypy daemon, pylint plugins) in
+        # the background at startup rather than on the first request of each kind
+        if warm_up:
+            threading.Thread(target=self._warm_up_backends, name='warm_up', daemon=True).start()
+
+    def _warm_up_backends(self) -> None:
+        """Start the pool workers, which warm up as they start, and warm up the in-process backends"""
+        pool = self._pool
+        if pool is not None:
+            try:
+                # Workers start on demand, one per submission while none is idle; each
+                # of these tasks holds its worker until all of them have started (and
+                # warmed up in their initializer), so no worker starts cold later
+                for _ in range(self._workers):
+                    pool.submit(_worker_ready)
+            except RuntimeError:
+                return  # closed before warm-up began
+        # With a pool, backends that only run in the workers are never imported here
+        self.analyzer.warm_up(skip=POOLED_METHODS if pool is not None else ())
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        """Create the worker pool for CPU-bound analyzers"""
+        # Synchronization primitives reach workers only as process arguments, so the
+        # barrier for _worker_ready travels with the initializer's
+        barrier = _POOL_CONTEXT.Barrier(self._workers)
+        return ProcessPoolExecutor(max_workers=self._workers, mp_context=_POOL_CONTEXT,
+                                   initializer=_init_worker, initargs=(self._warm_up, barrier))
+
+    def _run_in_pool(self, method: str, *args: Any) -> Any:
+        """Run an analyzer method in the worker pool (or in-process without one); an error dict if its worker died"""
+        pool = self._pool
+        if pool is None:
+            return getattr(self.analyzer, method)(*args)
+
+        try:
+            return pool.submit(_run_in_worker, method, *args).result()
+        except BrokenProcessPool:
+            # A worker died (crash or out of memory); replace the pool for later calls
+            with self._pool_lock:
+                if self._pool is pool:
+                    self._pool = self._create_pool()
+            return {
+                'success': False,
+                'error': f'{method} worker process terminated unexpectedly'
+            }
+
+    def _fanout_executor(self) -> ThreadPoolExecutor:
+        """Return the analyze_all thread pool, creating it on first use"""
+        if self._fanout is None:
+            with self._pool_lock:
+                if self._fanout is None:
+                    self._fanout = ThreadPoolExecutor(max_workers=len(ANALYZE_ALL_TOOLS),
+                                                      thread_name_prefix='analyze_all')
+        return self._fanout
+
+    def close(self) -> None:
+        """Shut down the worker pools"""
+        if self._fanout is not None:
+            self._fanout.shutdown(cancel_futures=True)
+            self._fanout = None
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
 
     def analyze_code(self, code: str, file_name: Optional[str] = None,
-                     python_version: Optional[str] = None) -> Dict[str, Any]:
+                     python_version: Optional[str] = None,
+                     limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze Python code for errors, warnings, and compatibility issues
         
@@ -18,25 +178,21 @@ class PythonTools:
             code: Python code to analyze
             file_name: Optional filename for context
             python_version: Target Python version (e.g., "3.8", "3.10", or "auto")
+            limit: Optional maximum number of diagnostics to return (counts cover all)
         
         Returns:
             Analysis results with diagnostics
         """
         file_name = file_name or "temp.py"
+        target_version = _parse_version(python_version)
 
-        # Parse target version
-        target_version = None
-        if python_version and python_version != "auto":
-            try:
-                parts = python_version.split('.')
-                target_version = (int(parts[0]), int(parts[1]) if len(parts) > 1 else 0)
-            except (ValueError, IndexError):
-                pass
-
-        return self.analyzer.analyze_code(code, file_name, target_version)
+        result = self._cache.get_or_compute(
+            'analyze_code', code, (file_name, target_version),
+            lambda: self.analyzer.analyze_code(code, file_name, target_version))
+        return self._limited(result, 'diagnostics', limit)
 
     def get_symbols(self, code: str, file_name: Optional[str] = None,
-                    filter: Optional[str] = None) -> Dict[str, Any]:
+                    filter: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Extract all symbols (classes, functions, variables) from Python code
         
@@ -44,6 +200,7 @@ class PythonTools:
             code: Python code to analyze
             file_name: Optional filename for context
             filter: Optional filter ('class', 'function', 'variable', or 'all')
+            limit: Optional maximum number of symbols to return (count covers all)
         
         Returns:
             List of symbols with their information
@@ -51,7 +208,10 @@ class PythonTools:
         file_name = file_name or "temp.py"
         filter_kind = filter if filter and filter != 'all' else None
 
-        return self.analyzer.get_symbols(code, file_name, filter_kind)
+        result = self._cache.get_or_compute(
+            'get_symbols', code, (file_name, filter_kind),
+            lambda: self.analyzer.get_symbols(code, file_name, filter_kind))
+        return self._limited(result, 'symbols', limit)
 
     def format_code(self, code: str) -> Dict[str, Any]:
         """
@@ -63,7 +223,20 @@ class PythonTools:
         Returns:
             Formatted code
         """
-        return self.analyzer.format_code(code)
+        return self._cache.get_or_compute(
+            'format_code', code, (),
+            lambda: self._format_and_seed(code))
+
+    def _format_and_seed(self, code: str) -> Dict[str, Any]:
+        """Run black, also caching its output as already formatted"""
+        result = self.analyzer.format_code(code)
+        formatted = result['formatted_code']
+        if result['success'] and formatted != code:
+            # black is idempotent, so formatting the output again would return it
+            # unchanged; editors typically send it straight back after a format
+            self._cache.put('format_code', formatted, (),
+                            {'success': True, 'formatted_code': formatted})
+        return result
 
     def calculate_metrics(self, code: str, file_name: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -77,51 +250,236 @@ class PythonTools:
             Code metrics
         """
         file_name = file_name or "temp.py"
-        return self.analyzer.calculate_metrics(code, file_name)
+        return self._cache.get_or_compute(
+            'calculate_metrics', code, (file_name,),
+            lambda: self.analyzer.calculate_metrics(code, file_name))
 
-    def type_check(self, code: str, file_name: Optional[str] = None) -> Dict[str, Any]:
+    def type_check(self, code: str, file_name: Optional[str] = None,
+                   limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Run static type checking using mypy
         
         Args:
             code: Python code to type check
             file_name: Optional filename for context
+            limit: Optional maximum number of diagnostics to return (counts cover all)
         
         Returns:
             Type checking results with errors and warnings
         """
         file_name = file_name or "temp.py"
-        return self.analyzer.type_check(code, file_name)
+        result = self._cache.get_or_compute(
+            'type_check', code, (file_name,),
+            lambda: self._run_in_pool('type_check', code, file_name))
+        return self._limited(result, 'diagnostics', limit)
 
-    def detect_dead_code(self, code: str, file_name: Optional[str] = None) -> Dict[str, Any]:
+    def detect_dead_code(self, code: str, file_name: Optional[str] = None,
+                         limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Detect unused functions, classes, and variables using vulture
         
         Args:
             code: Python code to analyze
             file_name: Optional filename for context
+            limit: Optional maximum number of unused code items to return (count covers all)
         
         Returns:
             List of unused code items
         """
         file_name = file_name or "temp.py"
-        return self.analyzer.detect_dead_code(code, file_name)
+        result = self._cache.get_or_compute(
+            'detect_dead_code', code, (file_name,),
+            lambda: self._run_in_pool('detect_dead_code', code, file_name))
+        return self._limited(result, 'unused_code', limit)
 
-    def comprehensive_lint(self, code: str, file_name: Optional[str] = None) -> Dict[str, Any]:
+    def comprehensive_lint(self, code: str, file_name: Optional[str] = None,
+                           limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Run comprehensive linting using pylint
         
         Args:
             code: Python code to analyze
             file_name: Optional filename for context
+            limit: Optional maximum number of diagnostics to return (counts cover all)
         
         Returns:
             Comprehensive linting results
         """
         file_name = file_name or "temp.py"
-        return self.analyzer.comprehensive_lint(code, file_name)
+        result = self._cache.get_or_compute(
+            'comprehensive_lint', code, (file_name,),
+            lambda: self._run_in_pool('comprehensive_lint', code, file_name))
+        return self._limited(result, 'diagnostics', limit)
+
+    @staticmethod
+    def _limited(result: Dict[str, Any], items_key: str, limit: Optional[int]) -> Dict[str, Any]:
+        """Return the result with at most limit items (the cached result itself is not modified)"""
+        items = result.get(items_key)
+        if limit is None or items is None or len(items) <= limit:
+            return result
+        return {**result, items_key: items[:max(0, limit)]}
+
+    @staticmethod
+    def _iter_result(result: Dict[str, Any], items_key: str) -> Iterator[Dict[str, Any]]:
+        """Yield the items of a finished result, followed by its remaining summary fields"""
+        if 'error' in result:
+            yield {'success': False, 'error': result['error']}
+            return
+        yield from result[items_key]
+        yield {key: value for key, value in result.items() if key != items_key}
+
+    def comprehensive_lint_stream(self, code: str, file_name: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Run comprehensive linting using pylint, yielding diagnostics as they are found
+        
+        Args:
+            code: Python code to analyze
+            file_name: Optional filename for context
+        
+        Returns:
+            Iterator of diagnostics followed by a summary (success and counts)
+        """
+        # Runs in-process: messages cannot be streamed back from a pool worker
+        return self.analyzer.iter_lint_diagnostics(code, file_name or "temp.py")
+
+    def type_check_stream(self, code: str, file_name: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Run static type checking using mypy, yielding one diagnostic at a time
+        
+        Args:
+            code: Python code to type check
+            file_name: Optional filename for context
+        
+        Returns:
+            Iterator of diagnostics followed by a summary (success and counts)
+        """
+        # mypy reports all errors at once, so this streams the finished result
+        return self._iter_result(self.type_check(code, file_name), 'diagnostics')
+
+    def detect_dead_code_stream(self, code: str, file_name: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Detect unused code using vulture, yielding one item at a time
+        
+        Args:
+            code: Python code to analyze
+            file_name: Optional filename for context
+        
+        Returns:
+            Iterator of unused code items followed by a summary (success and count)
+        """
+        # vulture reports all items at once, so this streams the finished result
+        return self._iter_result(self.detect_dead_code(code, file_name), 'unused_code')
+
+    def analyze_all(self, code: str, file_name: Optional[str] = None,
+                    python_version: Optional[str] = None,
+                    tools: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Run several analyzers concurrently and collect their results
+        
+        Args:
+            code: Python code to analyze
+            file_name: Optional filename for context
+            python_version: Target Python version for analyze_code (e.g., "3.8" or "auto")
+            tools: Analyzers to run (default: all of ANALYZE_ALL_TOOLS)
+        
+        Returns:
+            Overall success and each analyzer's result keyed by tool name
+        """
+        names = tools or ANALYZE_ALL_TOOLS
+        unknown = [name for name in names if name not in ANALYZE_ALL_TOOLS]
+        if unknown:
+            return {
+                'success': False,
+                'error': f"Unknown tools: {', '.join(unknown)}"
+            }
+
+        runners = {
+            'analyze_code': lambda: self.analyze_code(code, file_name, python_version),
+            'get_symbols': lambda: self.get_symbols(code, file_name),
+            'calculate_metrics': lambda: self.calculate_metrics(code, file_name),
+            'type_check': lambda: self.type_check(code, file_name),
+            'detect_dead_code': lambda: self.detect_dead_code(code, file_name),
+            'comprehensive_lint': lambda: self.comprehensive_lint(code, file_name)
+        }
 
-    def get_completions(self, code: str, line: int, column: int) -> Dict[str, Any]:
+        # mypy, vulture and pylint run side by side in the process pool and the
+        # in-process analyzers share one parse through the AST cache, so wall
+        # time is the slowest analyzer rather than the sum of all of them
+        executor = self._fanout_executor()
+        futures = [executor.submit(runners[name]) for name in names]
+        results = [future.result() for future in futures]
+        return {
+            'success': all(result.get('success', False) for result in results),
+            'results': dict(zip(names, results))
+        }
+
+    def _run_batch_in_pool(self, method: str, files: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Run a batch analyzer method in the worker pool, one result per file"""
+        results: Union[Dict[str, Any], List[Dict[str, Any]]] = self._run_in_pool(method, files)
+        if isinstance(results, dict):
+            # The worker died; every file gets its error
+            return [results] * len(files)
+        return results
+
+    def analyze_many(self, files: List[Tuple[str, str]],
+                     python_version: Optional[str] = None,
+                     tools: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Run analyzers over several files, with one mypy and one pylint run for all of them
+        
+        Args:
+            files: (file_name, code) pairs; file names must be unique
+            python_version: Target Python version for analyze_code (e.g., "3.8" or "auto")
+            tools: Analyzers to run (default: all of ANALYZE_ALL_TOOLS)
+        
+        Returns:
+            Overall success and, per file name, each analyzer's result keyed by tool name
+        """
+        names = tools or ANALYZE_ALL_TOOLS
+        unknown = [name for name in names if name not in ANALYZE_ALL_TOOLS]
+        if unknown:
+            return {
+                'success': False,
+                'error': f"Unknown tools: {', '.join(unknown)}"
+            }
+        if len({file_name for file_name, _ in files}) != len(files):
+            return {
+                'success': False,
+                'error': 'File names must be unique'
+            }
+
+        # Each file is still analyzed on its own; only mypy and pylint gain from
+        # a batch (startup and typeshed/astroid loading are shared), the others
+        # run in-process or hit the result cache file by file
+        runners = {
+            'analyze_code': lambda: [self.analyze_code(code, file_name, python_version)
+                                     for file_name, code in files],
+            'get_symbols': lambda: [self.get_symbols(code, file_name) for file_name, code in files],
+            'calculate_metrics': lambda: [self.calculate_metrics(code, file_name)
+                                          for file_name, code in files],
+            'type_check': lambda: self._run_batch_in_pool('type_check_many', files),
+            'detect_dead_code': lambda: [self.detect_dead_code(code, file_name)
+                                         for file_name, code in files],
+            'comprehensive_lint': lambda: self._run_batch_in_pool('comprehensive_lint_many', files)
+        }
+
+        executor = self._fanout_executor()
+        futures = [executor.submit(runners[name]) for name in names]
+        per_tool = [future.result() for future in futures]
+
+        results = {
+            file_name: {name: tool_results[i] for name, tool_results in zip(names, per_tool)}
+            for i, (file_name, _) in enumerate(files)
+        }
+        return {
+            'success': all(result.get('success', False)
+                           for tool_results in per_tool for result in tool_results),
+            'results': results
+        }
+
+    def get_completions(self, code: str, line: int, column: int,
+                        file_name: Optional[str] = None,
+                        limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Get code completions at a specific position using jedi
         
@@ -129,11 +487,15 @@ class PythonTools:
             code: Python code
             line: Line number (1-based)
             column: Column number (0-based)
+            file_name: Optional filename of the buffer (speeds up repeated edits)
+            limit: Optional maximum number of completions (at most 50 are returned)
         
         Returns:
             List of completion suggestions
         """
-        return self.analyzer.get_completions(code, line, column)
+        # Not cached: jedi infers from the project's other files too, so an
+        # unchanged buffer can still need different completions after an edit elsewhere
+        return self.analyzer.get_completions(code, line, column, file_name, limit)
 
     def format_with_autopep8(self, code: str, max_line_length: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -147,4 +509,22 @@ class PythonTools:
             Formatted code
         """
         max_line_length = max_line_length or 79
-        return self.analyzer.format_with_autopep8(code, max_line_length)
\ No newline at end of file
+        return self._cache.get_or_compute(
+            'format_with_autopep8', code, (max_line_length,),
+            lambda: self.analyzer.format_with_autopep8(code, max_line_length))
+
+    def clear_cache(self) -> None:
+        """Drop all cached tool results"""
+        self._cache.clear()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get result cache statistics
+        
+        Returns:
+            Hit/miss counters and cache sizes
+        """
+        return {
+            'result_cache': self._cache.stats(),
+            **self.analyzer.cache_stats()
+        }
\ No newline at end of file
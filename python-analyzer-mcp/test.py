@@ -1,16 +1,13 @@
 #!/usr/bin/env python3
 """Test script for Python Analyzer - Now with ALL features!"""
 import sys
+from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0, '.')
 
 from src.tools import PythonTools
 
-def test_analyzer():
-    """Test all analyzer functions"""
-    tools = PythonTools()
-
-    # Test code with various issues
-    test_code = """
+# Test code with various issues
+_TEST_CODE = """
 # Test Python 3.10+ feature
 def greet(name: str) -> str:
     match name:
@@ -26,10 +23,87 @@ if (y := 10) > 5:  # Walrus operator (3.8+)
     print(y)
 """
 
+_MESSY_CODE = "def test(  x,y  ):return x+y"
+
+_METRICS_CODE = """
+def complex_function(x):
+    if x > 0:
+        for i in range(x):
+            if i % 2 == 0:
+                print(i)
+    return x
+"""
+
+_TYPE_CHECK_CODE = """
+def greet(name: str) -> int:
+    return "Hello, " + name  # Type error: returns str not int
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+result: str = add(1, 2)  # Type error: int assigned to str
+"""
+
+_DEAD_CODE = """
+def used_function():
+    return "I'm used!"
+
+def unused_function():
+    return "Nobody calls me"
+
+def another_unused():
+    x = 10
+    y = 20
+    return x + y
+
+class UnusedClass:
+    def method(self):
+        pass
+
+result = used_function()
+"""
+
+_LINT_CODE = """
+def MyFunction(x):
+    y=x+1
+    return y
+
+def another_function():
+    pass
+"""
+
+_COMPLETION_CODE = """import os
+os."""
+
+_AUTOPEP8_CODE = "def test(  x,y,z  ):x=1;y=2;z=3;return x+y+z"
+
+
+def test_analyzer():
+    """Test all analyzer functions"""
+    tools = PythonTools()
+
+    # The tools are independent, so run them all at once (mypy, vulture and
+    # pylint in the process pool) and print the results in test order
+    jobs = {
+        # TEST 1 and 2 share one parse of the same code
+        'bundle': lambda: tools.analyze_all(_TEST_CODE, python_version="3.7",
+                                            tools=['analyze_code', 'get_symbols']),
+        'format': lambda: tools.format_code(_MESSY_CODE),
+        'metrics': lambda: tools.calculate_metrics(_METRICS_CODE),
+        'type_check': lambda: tools.type_check(_TYPE_CHECK_CODE, limit=3),
+        'dead_code': lambda: tools.detect_dead_code(_DEAD_CODE),
+        'lint': lambda: tools.comprehensive_lint(_LINT_CODE, limit=5),
+        'completions': lambda: tools.get_completions(_COMPLETION_CODE, line=2, column=3),
+        'autopep8': lambda: tools.format_with_autopep8(_AUTOPEP8_CODE, max_line_length=79),
+    }
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {name: executor.submit(job) for name, job in jobs.items()}
+    bundle = futures['bundle'].result()['results']
+
     print("=" * 80)
     print("TEST 1: Analyze Code (Python 3.7 target)")
     print("=" * 80)
-    result = tools.analyze_code(test_code, python_version="3.7")
+    result = bundle['analyze_code']
     print(f"Detected Version: {result['detected_version']}")
     print(f"Success: {result['success']}")
     print(f"Errors: {result['error_count']}, Warnings: {result['warning_count']}")
@@ -40,7 +114,7 @@ if (y := 10) > 5:  # Walrus operator (3.8+)
     print("\n" + "=" * 80)
     print("TEST 2: Extract Symbols")
     print("=" * 80)
-    symbol_result = tools.get_symbols(test_code)
+    symbol_result = bundle['get_symbols']
     print(f"Success: {symbol_result['success']}")
     print(f"Found {symbol_result['count']} symbols:")
     for symbol in symbol_result['symbols']:
@@ -50,26 +124,17 @@ if (y := 10) > 5:  # Walrus operator (3.8+)
     print("\n" + "=" * 80)
     print("TEST 3: Format Code")
     print("=" * 80)
-    messy_code = "def test(  x,y  ):return x+y"
-    format_result = tools.format_code(messy_code)
+    format_result = futures['format'].result()
     print(f"Success: {format_result['success']}")
     if format_result['success']:
-        print("Original:", messy_code)
+        print("Original:", _MESSY_CODE)
         print("Formatted:")
         print(format_result['formatted_code'])
 
     print("\n" + "=" * 80)
     print("TEST 4: Calculate Metrics")
     print("=" * 80)
-    metrics_code = """
-def complex_function(x):
-    if x > 0:
-        for i in range(x):
-            if i % 2 == 0:
-                print(i)
-    return x
-"""
-    metrics_result = tools.calculate_metrics(metrics_code)
+    metrics_result = futures['metrics'].result()
     print(f"Success: {metrics_result['success']}")
     if metrics_result['success']:
         metrics = metrics_result['metrics']
@@ -82,46 +147,19 @@ def complex_function(x):
     print("\n" + "=" * 80)
     print("TEST 5: Type Checking ⭐ NEW")
     print("=" * 80)
-    type_check_code = """
-def greet(name: str) -> int:
-    return "Hello, " + name  # Type error: returns str not int
-
-def add(a: int, b: int) -> int:
-    return a + b
-
-result: str = add(1, 2)  # Type error: int assigned to str
-"""
-    type_result = tools.type_check(type_check_code)
+    type_result = futures['type_check'].result()
     print(f"Success: {type_result['success']}")
     if 'error' in type_result:
         print(f"Note: {type_result['error']}")
     elif 'diagnostics' in type_result:
         print(f"Found {type_result['error_count']} type errors:")
-        for diag in type_result['diagnostics'][:3]:
+        for diag in type_result['diagnostics']:
             print(f"  Line {diag['line']}: {diag['message']}")
 
     print("\n" + "=" * 80)
     print("TEST 6: Dead Code Detection ⭐ NEW")
     print("=" * 80)
-    dead_code = """
-def used_function():
-    return "I'm used!"
-
-def unused_function():
-    return "Nobody calls me"
-
-def another_unused():
-    x = 10
-    y = 20
-    return x + y
-
-class UnusedClass:
-    def method(self):
-        pass
-
-result = used_function()
-"""
-    dead_result = tools.detect_dead_code(dead_code)
+    dead_result = futures['dead_code'].result()
     print(f"Success: {dead_result['success']}")
     if 'error' in dead_result:
         print(f"Note: {dead_result['error']}")
@@ -133,29 +171,19 @@ result = used_function()
     print("\n" + "=" * 80)
     print("TEST 7: Comprehensive Lint ⭐ NEW")
     print("=" * 80)
-    lint_code = """
-def MyFunction(x):
-    y=x+1
-    return y
-
-def another_function():
-    pass
-"""
-    lint_result = tools.comprehensive_lint(lint_code)
+    lint_result = futures['lint'].result()
     print(f"Success: {lint_result['success']}")
     if 'error' in lint_result:
         print(f"Note: {lint_result['error']}")
     elif 'diagnostics' in lint_result:
         print(f"Found {lint_result['warning_count']} warnings:")
-        for diag in lint_result['diagnostics'][:5]:
+        for diag in lint_result['diagnostics']:
             print(f"  [{diag['code']}] Line {diag['line']}: {diag['message']}")
 
     print("\n" + "=" * 80)
     print("TEST 8: Code Completion ⭐ NEW")
     print("=" * 80)
-    completion_code = """import os
-os."""
-    completion_result = tools.get_completions(completion_code, line=2, column=3)
+    completion_result = futures['completions'].result()
     print(f"Success: {completion_result['success']}")
     if 'error' in completion_result:
         print(f"Note: {completion_result['error']}")
@@ -168,13 +196,12 @@ os."""
     print("\n" + "=" * 80)
     print("TEST 9: Format with autopep8 ⭐ NEW")
     print("=" * 80)
-    autopep8_code = "def test(  x,y,z  ):x=1;y=2;z=3;return x+y+z"
-    autopep8_result = tools.format_with_autopep8(autopep8_code, max_line_length=79)
+    autopep8_result = futures['autopep8'].result()
     print(f"Success: {autopep8_result['success']}")
     if 'error' in autopep8_result:
         print(f"Note: {autopep8_result['error']}")
     elif autopep8_result['success']:
-        print("Original:", autopep8_code)
+        print("Original:", _AUTOPEP8_CODE)
         print("Formatted:")
         print(autopep8_result['formatted_code'])
 
@@ -195,4 +222,4 @@ os."""
     print("   Install all dependencies with: pip install -r requirements.txt")
 
 if __name__ == "__main__":
-    test_analyzer()
\ No newline at end of file
+    test_analyzer()
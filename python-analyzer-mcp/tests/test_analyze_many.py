@@ -0,0 +1,115 @@
+"""analyze_many: batched mypy and pylint results split back per file
+
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tools import PythonTools
+from src.tools.python_tools import WARM_UP_ENV
+
+FILES = [
+    ('typed.py', 'import os\n\n\ndef half(x: int) -> int:\n    return x / 2\n'),
+    ('clean.py', '"""Clean module"""\n\nVALUE: int = 1\n'),
+    ('names.py', 'def greet() -> None:\n    print(nme)\n\n\nx: str = 1\n'),
+    # Checked on its own: a syntax error stops mypy for every file of a run
+    ('broken.py', 'def broken(:\n    pass\n'),
+]
+
+
+def without_parse_message(result):
+    """Drop E0001 message text, which names the temporary module pylint parsed"""
+    diagnostics = [dict(d, message=None) if d['code'] == 'E0001' else d
+                   for d in result.get('diagnostics', [])]
+    return dict(result, diagnostics=diagnostics)
+
+
+class AnalyzeManyTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tools = PythonTools(warm_up=False, workers=0)
+        cls.result = cls.tools.analyze_many(FILES, tools=['type_check', 'comprehensive_lint'])
+
+    def test_each_file_gets_what_checking_it_alone_gives(self):
+        self.assertEqual(list(self.result['results']), [name for name, _ in FILES])
+        for file_name, code in FILES:
+            with self.subTest(file=file_name):
+                results = self.result['results'][file_name]
+                self.assertEqual(results['type_check'], self.tools.type_check(code, file_name))
+                self.assertEqual(without_parse_message(results['comprehensive_lint']),
+                                 without_parse_message(self.tools.comprehensive_lint(code, file_name)))
+
+    def test_diagnostics_name_their_own_file(self):
+        for file_name, _ in FILES:
+            with self.subTest(file=file_name):
+                results = self.result['results'][file_name]
+                for tool in ('type_check', 'comprehensive_lint'):
+                    files = {d['file'] for d in results[tool].get('diagnostics', [])}
+                    self.assertLessEqual(files, {file_name})
+
+    def test_findings_stay_with_their_file(self):
+        results = self.result['results']
+        type_lines = {name: [d['line'] for d in results[name]['type_check']['diagnostics']]
+                      for name in ('typed.py', 'clean.py', 'names.py')}
+        self.assertEqual(type_lines, {'typed.py': [5], 'clean.py': [], 'names.py': [2, 5]})
+        self.assertTrue(results['clean.py']['type_check']['success'])
+        self.assertFalse(results['broken.py']['type_check']['success'])
+
+        lint_codes = {name: {d['code'] for d in results[name]['comprehensive_lint']['diagnostics']}
+                      for name in ('typed.py', 'clean.py', 'names.py')}
+        self.assertIn('W0611', lint_codes['typed.py'])  # unused import os
+        self.assertIn('E0602', lint_codes['names.py'])  # undefined nme
+        self.assertEqual(lint_codes['clean.py'], set())
+        self.assertEqual([d['code'] for d in results['broken.py']['comprehensive_lint']['diagnostics']],
+                         ['E0001'])
+        self.assertFalse(self.result['success'])
+
+    def test_duplicate_file_names_are_rejected(self):
+        result = self.tools.analyze_many([('a.py', 'x = 1\n'), ('a.py', 'y = 2\n')])
+        self.assertEqual(result, {'success': False, 'error': 'File names must be unique'})
+
+
+class AnalyzeManyRouteTest(unittest.TestCase):
+
+    def setUp(self):
+        from fastapi.testclient import TestClient
+        import http_server
+
+        # In-process analyzers without warm-up keep the test light
+        patcher = mock.patch.dict(os.environ, {http_server.WORKERS_ENV: '0', WARM_UP_ENV: '0'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(http_server.app)
+        self.client.__enter__()
+        self.addCleanup(self.client.__exit__, None, None, None)
+
+    def post(self, body):
+        return self.client.post('/api/python/analyze-many', json=body)
+
+    def test_duplicate_file_names_get_400(self):
+        response = self.post({'files': [{'fileName': 'a.py', 'code': 'x = 1\n'},
+                                        {'fileName': 'a.py', 'code': 'y = 2\n'}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'detail': 'File names must be unique'})
+
+    def test_unknown_tool_gets_400(self):
+        response = self.post({'files': [{'fileName': 'a.py', 'code': 'x = 1\n'}], 'tools': ['nope']})
+        self.assertEqual(response.status_code, 400)
+
+    def test_results_are_keyed_by_file_name(self):
+        response = self.post({'files': [{'fileName': 'a.py', 'code': 'x: int = "a"\n'},
+                                        {'fileName': 'b.py', 'code': 'y: int = 2\n'}],
+                              'tools': ['type_check']})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(results['a.py']['type_check']['diagnostics'][0]['file'], 'a.py')
+        self.assertTrue(results['b.py']['type_check']['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""AstCache under concurrent callers: one parse per source, cached failures
+
+Run with: python -m unittest discover tests
+"""
+import ast
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ast_cache import AstCache
+
+TIMEOUT = 5
+
+# The real parser: patching src.ast_cache.ast.parse replaces ast.parse itself
+PARSE = ast.parse
+
+
+class GatedParse:
+    """ast.parse stand-in that counts calls and holds the first one until released"""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, code, filename='<unknown>'):
+        self.calls += 1
+        if self.calls == 1:
+            self.started.set()
+            self.release.wait(TIMEOUT)
+            if self.error is not None:
+                raise self.error
+        return PARSE(code, filename=filename)
+
+
+class Caller(threading.Thread):
+    """Thread that runs one AstCache.get and keeps its tree or exception"""
+
+    def __init__(self, cache, code, file_name='<unknown>'):
+        super().__init__(daemon=True)
+        self.cache = cache
+        self.code = code
+        self.file_name = file_name
+        self.tree = None
+        self.error = None
+
+    def run(self):
+        try:
+            self.tree = self.cache.get(self.code, self.file_name)
+        except BaseException as e:
+            self.error = e
+
+
+class AstCacheConcurrencyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = AstCache()
+
+    def run_while_parsing(self, parse, *callers):
+        """Start callers one by one while the first holds the parse, then release it"""
+        with mock.patch('src.ast_cache.ast.parse', parse):
+            first, *waiters = callers
+            first.start()
+            self.assertTrue(parse.started.wait(TIMEOUT))
+            for waiter in waiters:
+                waiter.start()
+                # Blocked on the first caller's parse rather than parsing its own
+                waiter.join(0.1)
+                self.assertTrue(waiter.is_alive())
+            parse.release.set()
+            for caller in callers:
+                caller.join(TIMEOUT)
+                self.assertFalse(caller.is_alive())
+        self.assertEqual(self.cache._pending, {})
+
+    def test_concurrent_callers_share_one_parse(self):
+        parse = GatedParse()
+        callers = [Caller(self.cache, 'x = 1\n') for _ in range(3)]
+        self.run_while_parsing(parse, *callers)
+
+        self.assertEqual(parse.calls, 1)
+        self.assertIsInstance(callers[0].tree, ast.Module)
+        for caller in callers:
+            self.assertIsNone(caller.error)
+            self.assertIs(caller.tree, callers[0].tree)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (2, 1, 1))
+
+    def test_waiters_get_the_syntax_error(self):
+        parse = GatedParse()
+        callers = [Caller(self.cache, 'def broken(:\n', name) for name in ('a.py', 'b.py')]
+        self.run_while_parsing(parse, *callers)
+
+        self.assertEqual(parse.calls, 1)
+        for caller, name in zip(callers, ('a.py', 'b.py')):
+            self.assertIsInstance(caller.error, SyntaxError)
+            self.assertEqual((caller.error.filename, caller.error.lineno), (name, 1))
+        self.assertIsNot(callers[0].error, callers[1].error)
+
+    def test_syntax_error_is_cached_and_reraised(self):
+        with mock.patch('src.ast_cache.ast.parse', wraps=PARSE) as parse:
+            with self.assertRaises(SyntaxError) as first:
+                self.cache.get('def broken(:\n', 'a.py')
+            with self.assertRaises(SyntaxError) as second:
+                self.cache.get('def broken(:\n', 'b.py')
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(first.exception.filename, 'a.py')
+        self.assertEqual(second.exception.filename, 'b.py')
+        self.assertEqual(second.exception.msg, first.exception.msg)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_failed_parse_releases_waiters(self):
+        parse = GatedParse(error=RecursionError('too deep'))
+        first, waiter = Caller(self.cache, 'x = 1\n'), Caller(self.cache, 'x = 1\n')
+        self.run_while_parsing(parse, first, waiter)
+
+        self.assertIsInstance(first.error, RecursionError)
+        # Nothing was cached, so the waiter parsed the source itself
+        self.assertIsNone(waiter.error)
+        self.assertIsInstance(waiter.tree, ast.Module)
+        self.assertEqual(parse.calls, 2)
+        self.assertIs(self.cache.get('x = 1\n'), waiter.tree)
+
+
+if __name__ == '__main__':
+    unittest.main()
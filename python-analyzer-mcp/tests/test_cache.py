@@ -0,0 +1,110 @@
+"""ResultCache eviction, key separation and hit/miss accounting
+
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cache import ResultCache
+from src.tools import PythonTools
+
+
+class Counter:
+    """compute callable that records how often the tool really ran"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {'success': True, 'call': self.calls}
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def test_hit_returns_the_stored_result(self):
+        cache = ResultCache()
+        compute = Counter()
+        first = cache.get_or_compute('get_symbols', 'x = 1', (None,), compute)
+        second = cache.get_or_compute('get_symbols', 'x = 1', (None,), compute)
+        self.assertIs(first, second)
+        self.assertEqual(compute.calls, 1)
+
+    def test_keys_separate_tool_code_and_arguments(self):
+        cache = ResultCache()
+        compute = Counter()
+        calls = [
+            ('get_symbols', 'x = 1', (None,)),
+            ('calculate_metrics', 'x = 1', (None,)),  # another tool
+            ('get_symbols', 'x = 2', (None,)),  # other code
+            ('get_symbols', 'x = 1', ('a.py',)),  # other arguments
+        ]
+        results = [cache.get_or_compute(tool, code, args, compute) for tool, code, args in calls]
+        self.assertEqual([result['call'] for result in results], [1, 2, 3, 4])
+        # Each of them is now cached on its own
+        for (tool, code, args), result in zip(calls, results):
+            self.assertIs(cache.get_or_compute(tool, code, args, compute), result)
+        self.assertEqual(compute.calls, 4)
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(maxsize=2)
+        compute = Counter()
+        cache.get_or_compute('tool', 'a', (), compute)
+        cache.get_or_compute('tool', 'b', (), compute)
+        cache.get_or_compute('tool', 'a', (), compute)  # a is now the most recent
+        cache.get_or_compute('tool', 'c', (), compute)  # evicts b
+        self.assertEqual(compute.calls, 3)
+        self.assertEqual(cache.stats()['size'], 2)
+
+        cache.get_or_compute('tool', 'a', (), compute)
+        cache.get_or_compute('tool', 'c', (), compute)
+        self.assertEqual(compute.calls, 3)
+        cache.get_or_compute('tool', 'b', (), compute)
+        self.assertEqual(compute.calls, 4)
+
+    def test_put_refreshes_and_evicts(self):
+        cache = ResultCache(maxsize=2)
+        compute = Counter()
+        cache.put('tool', 'a', (), {'success': True, 'call': 0})
+        cache.get_or_compute('tool', 'b', (), compute)
+        cache.put('tool', 'a', (), {'success': True, 'call': -1})  # a is now the most recent
+        cache.get_or_compute('tool', 'c', (), compute)  # evicts b
+        self.assertEqual(cache.get_or_compute('tool', 'a', (), compute)['call'], -1)
+        self.assertEqual(compute.calls, 2)
+
+    def test_stats_count_hits_and_misses(self):
+        cache = ResultCache(maxsize=8)
+        compute = Counter()
+        self.assertEqual(cache.stats()['hit_rate'], 0.0)
+        for code in ('a', 'b', 'a', 'a'):
+            cache.get_or_compute('tool', code, (), compute)
+        self.assertEqual(cache.stats(), {
+            'hits': 2, 'misses': 2, 'size': 2, 'maxsize': 8, 'hit_rate': 0.5
+        })
+
+        cache.clear()
+        self.assertEqual(cache.stats(), {
+            'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 8, 'hit_rate': 0.0
+        })
+
+
+class ToolCacheStatsTest(unittest.TestCase):
+
+    def test_cache_stats_count_tool_calls(self):
+        tools = PythonTools(warm_up=False, workers=0)
+        tools.get_symbols('class A:\n    pass\n')
+        tools.get_symbols('class A:\n    pass\n')
+        tools.get_symbols('class A:\n    pass\n', filter='class')
+        stats = tools.cache_stats()['result_cache']
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 2, 2))
+
+        tools.clear_cache()
+        stats = tools.cache_stats()['result_cache']
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
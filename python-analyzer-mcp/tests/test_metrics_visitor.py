@@ -0,0 +1,150 @@
+"""Parity of MetricsVisitor with radon's complexity visitor
+
+Run with: python -m unittest discover tests
+"""
+import ast
+import importlib.util
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.metrics_visitor import MetricsVisitor
+
+try:
+    from radon.complexity import cc_visit_ast
+    from radon.visitors import ComplexityVisitor
+except ImportError:  # radon is optional at runtime
+    cc_visit_ast = None
+
+# Standard library modules with a wide mix of functions, classes and control flow
+CORPUS_MODULES = (
+    'argparse', 'ast', 'asyncio.base_events', 'collections', 'dataclasses',
+    'email.message', 'functools', 'json.decoder', 'pathlib', 'tarfile',
+    'typing', 'unittest.case', 'zipfile',
+)
+
+# Every construct the visitor scores, including the ones the stdlib rarely uses
+CONSTRUCTS = '''
+import asyncio
+
+def branches(x, items):
+    assert x, "x"
+    if x > 1 and x < 10 or not x:
+        pass
+    elif x:
+        y = 1 if x else 2
+    for i in items:
+        continue
+    else:
+        pass
+    while x:
+        break
+    try:
+        pass
+    except ValueError:
+        pass
+    except (TypeError, KeyError):
+        pass
+    else:
+        pass
+    finally:
+        pass
+    return [i for i in items if i if i > 1] + [j for i in items for j in i]
+
+def matching(command):
+    match command:
+        case "go":
+            return 1
+        case [x, y] if x:
+            return 2
+        case _:
+            return 3
+
+def capture(command):
+    match command:
+        case {"a": 1}:
+            return 1
+        case other:
+            return other
+
+async def coroutine(items):
+    async for item in items:
+        pass
+    async with items:
+        pass
+    return [x async for x in items if x]
+
+def outer(x):
+    def inner(y):
+        if y:
+            return lambda z: z if z else None
+    class Local:
+        def method(self):
+            if x:
+                pass
+    return inner
+
+class Empty:
+    pass
+
+class Single:
+    def method(self, x):
+        return x or None
+
+class Several:
+    attribute = [a for a in range(3) if a]
+
+    @property
+    def first(self):
+        if self:
+            return 1
+
+    async def second(self):
+        while self:
+            pass
+
+    class Nested:
+        def method(self):
+            if self:
+                pass
+'''
+
+
+def corpus():
+    """(name, source) of every module in the corpus, plus the constructs sample"""
+    yield 'constructs', CONSTRUCTS
+    for name in CORPUS_MODULES:
+        with open(importlib.util.find_spec(name).origin, encoding='utf-8') as f:
+            yield name, f.read()
+
+
+@unittest.skipIf(cc_visit_ast is None, 'radon is not installed')
+class MetricsVisitorParityTest(unittest.TestCase):
+    """MetricsVisitor must give the numbers calculate_metrics used to get from radon"""
+
+    def test_matches_radon(self):
+        for name, code in corpus():
+            with self.subTest(module=name):
+                tree = ast.parse(code)
+                visitor = MetricsVisitor()
+                visitor.visit(tree)
+                result = visitor.result()
+
+                blocks = cc_visit_ast(tree)
+                total = sum(block.complexity for block in blocks)
+                self.assertEqual(result['cyclomatic_complexity'], total)
+                self.assertAlmostEqual(result['average_complexity'],
+                                       total / len(blocks) if blocks else 0.0)
+                self.assertEqual(visitor.total_complexity,
+                                 ComplexityVisitor.from_ast(tree).total_complexity)
+                self.assertEqual(result['function_count'], sum(
+                    isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+                    for node in ast.walk(tree)))
+                self.assertEqual(result['class_count'], sum(
+                    isinstance(node, ast.ClassDef) for node in ast.walk(tree)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Parity of analyze_raw with radon.raw.analyze
+
+Run with: python -m unittest discover tests
+"""
+import importlib.util
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.raw_metrics import analyze_raw
+
+try:
+    from radon.raw import analyze
+except ImportError:  # radon is optional at runtime
+    analyze = None
+
+CORPUS_MODULES = (
+    'argparse', 'ast', 'calendar', 'contextlib', 'dataclasses', 'email.message',
+    'functools', 'json.decoder', 'pathlib', 'shlex', 'string', 'textwrap', 'tokenize',
+)
+
+# Constructs whose counting rules are easy to get wrong
+SAMPLES = {
+    'docstrings': '"""Module docstring"""\n\ndef f():\n    """\n    Multi-line\n\n    docstring\n    """\n    return 1\n',
+    'comments': '# leading\nx = 1  # trailing\n\n    # indented\ny = [\n    1,  # inside brackets\n    2,\n]\n',
+    'logical lines': 'if x: y = 1\nif x:  # only a comment\n    pass\ntry: 1 / 0\nexcept ZeroDivisionError: pass\na = 1; b = 2; c = {1: 2}\nf = lambda v: v\n',
+    'continuations': 'total = 1 + \\\n    2\ns = ("a"\n     "b")\nt = """x\n\ny"""\n',
+    'blank and empty': '\n\n   \nx = 1\n\n',
+    # Line breaks that str.splitlines() honours but the tokenizer does not
+    'carriage returns': 'x = 1\ry = (1,\r2)\r',
+    'form feeds': '\x0c\nclass A:\n    pass\n\x0c\n# c\n',
+    'form feed in a docstring': "def f():\n    '''doc\x0c\n    more'''\n    return 1\n",
+    'separator in a comment': '# a\x1cb\nx = 1\n',
+    'vertical tab': 'if x: y = 1; z = 2\x0b\n',
+}
+
+
+def counts(code):
+    """Counts as a plain tuple, or the exception type the analysis raised"""
+    try:
+        return tuple(analyze_raw(code))
+    except Exception as e:
+        return type(e)
+
+
+def radon_counts(code):
+    """radon's counts as a plain tuple, or the exception type it raised"""
+    try:
+        return tuple(analyze(code))
+    except Exception as e:
+        return type(e)
+
+
+@unittest.skipIf(analyze is None, 'radon is not installed')
+class RawMetricsParityTest(unittest.TestCase):
+    """analyze_raw must give radon.raw.analyze's counts field for field"""
+
+    def test_samples_match_radon(self):
+        for name, code in SAMPLES.items():
+            with self.subTest(sample=name):
+                self.assertEqual(counts(code), radon_counts(code))
+
+    def test_stdlib_modules_match_radon(self):
+        for name in CORPUS_MODULES:
+            with self.subTest(module=name):
+                with open(importlib.util.find_spec(name).origin, encoding='utf-8') as f:
+                    code = f.read()
+                self.assertEqual(counts(code), radon_counts(code))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""SymbolKind labels and the get_symbols kind filter
+
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import SymbolKind
+from src.services.python_analyzer import PythonAnalyzer
+
+CODE = '''
+import os
+
+class Shape:
+    def area(self) -> float:
+        return 0.0
+
+def main():
+    pass
+
+count: int = 1
+'''
+
+
+class SymbolKindTest(unittest.TestCase):
+
+    def test_labels_round_trip(self):
+        for kind in SymbolKind:
+            with self.subTest(kind=kind):
+                self.assertEqual(kind.label, kind.name.lower())
+                self.assertIs(SymbolKind.from_label(kind.label), kind)
+
+    def test_from_label_is_case_sensitive(self):
+        for label in ('Class', 'FUNCTION', 'Variable', 'all', 'module', ''):
+            with self.subTest(label=label):
+                self.assertIsNone(SymbolKind.from_label(label))
+
+
+class SymbolFilterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.analyzer = PythonAnalyzer()
+
+    def names(self, filter_kind):
+        result = self.analyzer.get_symbols(CODE, filter_kind=filter_kind)
+        self.assertTrue(result['success'])
+        return [symbol['name'] for symbol in result['symbols']]
+
+    def test_filter_by_kind(self):
+        self.assertEqual(self.names(None), ['Shape', 'main', 'count', 'area'])
+        self.assertEqual(self.names('all'), self.names(None))
+        self.assertEqual(self.names('class'), ['Shape'])
+        self.assertEqual(self.names('function'), ['main', 'area'])
+        self.assertEqual(self.names('variable'), ['count'])
+        self.assertEqual(self.names('method'), [])
+
+    def test_filter_matches_labels_exactly(self):
+        # As before kinds became an enum, a label in another case matches nothing
+        for filter_kind in ('Class', 'FUNCTION', 'ALL', 'unknown'):
+            with self.subTest(filter=filter_kind):
+                self.assertEqual(self.names(filter_kind), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Order of get_symbols' results: ast.walk's breadth-first order
+
+Run with: python -m unittest discover tests
+"""
+import ast
+import importlib.util
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.python_analyzer import PythonAnalyzer, _SymbolCollector
+
+CORPUS_MODULES = (
+    'argparse', 'ast', 'asyncio.base_events', 'collections', 'dataclasses',
+    'email.message', 'functools', 'pathlib', 'typing', 'unittest.case',
+)
+
+# Definitions nested at every depth, inside blocks of every statement kind
+NESTED = '''
+x: int = 1
+
+class Outer:
+    a: str = "a"
+
+    class Inner:
+        b: int = 2
+
+        def deep(self) -> None:
+            c: int = 3
+
+            class Local:
+                d: int = 4
+
+    def method(self):
+        def closure():
+            e: int = 5
+        if self:
+            f: int = 6
+            for i in range(3):
+                def in_loop(): pass
+        else:
+            class InElse: pass
+        return closure
+
+async def coroutine():
+    async with ctx:
+        g: int = 7
+    try:
+        def in_try(): pass
+    except ValueError:
+        h: int = 8
+    finally:
+        class InFinally: pass
+    while True:
+        match g:
+            case 1:
+                def in_case(): pass
+
+@decorator
+def last(): pass
+
+y: float = 2.0
+'''
+
+
+def walk_symbols(analyzer, code):
+    """The symbols get_symbols reported when it walked the tree with ast.walk"""
+    symbols = (analyzer._extract_symbol(node, code) for node in ast.walk(ast.parse(code)))
+    return [analyzer._symbol_to_dict(symbol) for symbol in symbols if symbol]
+
+
+class SymbolOrderTest(unittest.TestCase):
+    """get_symbols must list symbols in the order the ast.walk version did"""
+
+    def setUp(self):
+        self.analyzer = PythonAnalyzer()
+
+    def assert_walk_order(self, code):
+        result = self.analyzer.get_symbols(code)
+        self.assertTrue(result['success'])
+        self.assertEqual(result['symbols'], walk_symbols(self.analyzer, code))
+
+    def test_nested_definitions(self):
+        self.assert_walk_order(NESTED)
+        names = [symbol['name'] for symbol in self.analyzer.get_symbols(NESTED)['symbols']]
+        # Breadth first: every module-level symbol comes before any nested one
+        self.assertEqual(names[:5], ['x', 'Outer', 'coroutine', 'last', 'y'])
+
+    def test_stdlib_modules(self):
+        for name in CORPUS_MODULES:
+            with self.subTest(module=name):
+                with open(importlib.util.find_spec(name).origin, encoding='utf-8') as f:
+                    self.assert_walk_order(f.read())
+
+    def test_collects_only_definitions(self):
+        tree = ast.parse(NESTED)
+        expected = [node for node in ast.walk(tree)
+                    if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef,
+                                         ast.AnnAssign, ast.Assign))]
+        self.assertEqual(_SymbolCollector().collect(tree), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""type_check through the mypy daemon and through the in-process fallback
+
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.python_analyzer import HAS_MYPY, PythonAnalyzer
+
+BAD = 'x: int = "a"\n'
+# The same size as BAD, so only the mtime tells the daemon the file changed
+GOOD = 'x: str = "a"\n'
+UNDEFINED = 'def f() -> None:\n    print(y)\n'
+
+
+def messages(result):
+    """Diagnostics of a result as (line, severity, message) tuples"""
+    return [(d['line'], d['severity'], d['message']) for d in result['diagnostics']]
+
+
+@unittest.skipUnless(HAS_MYPY, 'mypy is not installed')
+class DaemonTypeCheckTest(unittest.TestCase):
+    """Checks run through this analyzer's mypy daemon"""
+
+    def setUp(self):
+        self.analyzer = PythonAnalyzer()
+        self.addCleanup(self.analyzer._stop_dmypy)
+
+    def test_reports_errors(self):
+        result = self.analyzer.type_check(BAD)
+        self.assertIsNotNone(self.analyzer._dmypy_files)
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error_count'], 1)
+        self.assertEqual(result['diagnostics'][0]['line'], 1)
+        self.assertIn('Incompatible types in assignment', result['diagnostics'][0]['message'])
+
+    def test_sees_each_edit(self):
+        self.assertFalse(self.analyzer.type_check(BAD)['success'])
+        self.assertTrue(self.analyzer.type_check(GOOD)['success'])
+        self.assertFalse(self.analyzer.type_check(BAD)['success'])
+        self.assertEqual(self.analyzer.type_check(UNDEFINED)['error_count'], 1)
+
+    def test_restarts_a_stopped_daemon(self):
+        self.assertFalse(self.analyzer.type_check(BAD)['success'])
+        from mypy import api as mypy_api
+        status, _ = self.analyzer._dmypy_files
+        mypy_api.run_dmypy(['--status-file', status, 'stop'])
+
+        result = self.analyzer.type_check(UNDEFINED)
+        self.assertFalse(self.analyzer._dmypy_unavailable)
+        self.assertEqual(result['error_count'], 1)
+        self.assertEqual(result['diagnostics'][0]['line'], 2)
+
+
+@unittest.skipUnless(HAS_MYPY, 'mypy is not installed')
+class FallbackTypeCheckTest(unittest.TestCase):
+    """Checks run by mypy in-process when the daemon cannot start"""
+
+    def setUp(self):
+        self.analyzer = PythonAnalyzer()
+        patcher = mock.patch.object(self.analyzer, '_start_dmypy', return_value=None)
+        self.start_dmypy = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_falls_back_to_mypy_api(self):
+        result = self.analyzer.type_check(BAD)
+        self.assertTrue(self.analyzer._dmypy_unavailable)
+        self.assertIsNone(self.analyzer._dmypy_files)
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error_count'], 1)
+        self.assertTrue(self.analyzer.type_check(GOOD)['success'])
+        # The daemon is not tried again once it failed to start
+        self.assertEqual(self.start_dmypy.call_count, 1)
+
+    def test_matches_the_daemon(self):
+        daemon = PythonAnalyzer()
+        self.addCleanup(daemon._stop_dmypy)
+        for code in (BAD, GOOD, UNDEFINED):
+            with self.subTest(code=code):
+                self.assertEqual(messages(self.analyzer.type_check(code)),
+                                 messages(daemon.type_check(code)))
+        self.assertIsNotNone(daemon._dmypy_files)
+
+
+if __name__ == '__main__':
+    unittest.main()
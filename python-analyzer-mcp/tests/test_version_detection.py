@@ -0,0 +1,142 @@
+"""Syntax feature detection behind detect_python_version
+
+Run with: python -m unittest discover tests
+"""
+import ast
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.python_analyzer import (PythonAnalyzer, _FEATURE_NODE_TYPES, _TREE_FEATURE_ROLES,
+                                          _token_features, _tree_features)
+
+# (code, features _tree_features finds): every entry of _TREE_FEATURE_ROLES is covered
+TREE_CASES = (
+    ('match command:\n    case 1:\n        pass\n', {'match'}),
+    ('if (n := 10) > 5:\n    pass\n', {'walrus'}),
+    ('x = f"{1}"\n', {'fstring'}),
+    ('async def f():\n    pass\n', {'async'}),
+    ('async def f():\n    async for x in y:\n        pass\n', {'async'}),
+    ('async def f():\n    async with y:\n        pass\n', {'async'}),
+    ('async def f():\n    await y\n', {'async'}),
+    ('print("x")\n', {'print_call'}),
+    ('log("x")\n', set()),
+    ('print >>sys.stderr, "x"\n', {'print_stmt'}),
+    ('x = a >> b\n', set()),
+    # X | Y in each kind of annotation, and only there
+    ('def f(x: int | None): pass\n', {'union_pipe'}),
+    ('def f() -> int | None: pass\n', {'union_pipe'}),
+    ('async def f() -> int | None: pass\n', {'async', 'union_pipe'}),
+    ('x: int | None = None\n', {'union_pipe'}),
+    ('x = a | b\n', set()),
+    ('def f(x: int): pass\n', set()),
+    # PEP 563 leaves annotations unevaluated, so X | Y works on earlier versions
+    ('from __future__ import annotations\ndef f(x: int | None): pass\n', set()),
+    ('from __future__ import division\ndef f(x: int | None): pass\n', {'union_pipe'}),
+    ('from typing import annotations\ndef f(x: int | None): pass\n', {'union_pipe'}),
+    ('', set()),
+)
+
+# Features named only inside strings and comments, which the old substring scans reported
+LITERAL_CASES = (
+    'x = "a := b"\n',
+    'x = "match x:"\n',
+    "x = 'async def f(): await g()'\n",
+    'x = "print >>sys.stderr"\n',
+    "x = 'f\"{y}\"'\n",
+    'def f(x: "int | None"): pass\n',
+    '# if (n := 10) > 5:\n# match x:\nx = 1\n',
+    'x = """\nmatch command:\n    case 1:\n        pass\n"""\n',
+)
+
+# (code that does not parse, features _token_features finds before giving up)
+TOKEN_CASES = (
+    ('if (n := 10) > 5\n    pass\n', {'walrus'}),
+    ('match command:\n    case 1 pass\n', {'match'}),
+    ('match = 1 +\n', set()),
+    ('print "hello"\n', {'print_stmt'}),
+    ('print >>sys.stderr, "x" +\n', {'print_stmt'}),
+    ('print("x" +\n', {'print_call'}),
+    ('x = f"{a}" +\n', {'fstring'}),
+    ("x = rb'a' + Rf'{b}' +\n", {'fstring'}),
+    ('async def f(:\n', {'async'}),
+    ('x = await g( +\n', {'async'}),
+    ('await = 1 +\n', set()),
+    # The literal false positives stay fixed on the fallback path
+    ('x = "a := b" +\n', set()),
+    ('# match x:\nx = (\n', set()),
+)
+
+
+class TreeFeaturesTest(unittest.TestCase):
+
+    def test_cases(self):
+        for code, expected in TREE_CASES:
+            with self.subTest(code=code):
+                self.assertEqual(_tree_features(ast.parse(code)), expected)
+
+    def test_cases_cover_every_role(self):
+        covered = {type(node) for code, _ in TREE_CASES for node in ast.walk(ast.parse(code))}
+        self.assertLessEqual(set(_TREE_FEATURE_ROLES), covered)
+        self.assertLessEqual(set(_FEATURE_NODE_TYPES.values()) | {'union_pipe', 'print_call', 'print_stmt'},
+                             set().union(*(expected for _, expected in TREE_CASES)))
+
+    def test_literals_are_not_features(self):
+        for code in LITERAL_CASES:
+            with self.subTest(code=code):
+                self.assertEqual(_tree_features(ast.parse(code)), set())
+
+
+class TokenFeaturesTest(unittest.TestCase):
+
+    def test_cases(self):
+        for code, expected in TOKEN_CASES:
+            with self.subTest(code=code):
+                with self.assertRaises(SyntaxError):
+                    ast.parse(code)
+                self.assertEqual(_token_features(code), expected)
+
+    def test_agrees_with_the_tree_on_code_that_parses(self):
+        for code, expected in TREE_CASES + tuple((code, set()) for code in LITERAL_CASES):
+            if 'union_pipe' in expected or 'annotations' in code:
+                continue  # telling annotations apart needs the tree
+            with self.subTest(code=code):
+                self.assertEqual(_token_features(code), expected)
+
+
+class DetectVersionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.analyzer = PythonAnalyzer()
+
+    def test_newest_feature_wins(self):
+        cases = (
+            ('match command:\n    case 1:\n        pass\n', (3, 10)),
+            ('def f(x: int | None): pass\n', (3, 10)),
+            ('if (n := f"{1}") > 5:\n    pass\n', (3, 8)),
+            ('x = f"{1}"\n', (3, 6)),
+            ('async def f():\n    print(await g())\n', (3, 5)),
+            ('print("x")\n', (3, 0)),
+            ('print "hello"\n', (2, 7)),
+        )
+        for code, expected in cases:
+            with self.subTest(code=code):
+                self.assertEqual(self.analyzer.detect_python_version(code), expected)
+
+    def test_literals_fall_back_to_the_runtime_version(self):
+        for code in LITERAL_CASES:
+            with self.subTest(code=code):
+                self.assertEqual(self.analyzer.detect_python_version(code),
+                                 self.analyzer.current_version)
+
+    def test_markers_override_syntax(self):
+        self.assertEqual(self.analyzer.detect_python_version(
+            '#!/usr/bin/env python3.9\nprint("x")\n'), (3, 9))
+        self.assertEqual(self.analyzer.detect_python_version(
+            '# requires: python>=3.8\nmatch x:\n    case 1:\n        pass\n'), (3, 8))
+
+
+if __name__ == '__main__':
+    unittest.main()